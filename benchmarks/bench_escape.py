@@ -0,0 +1,69 @@
+# benchmarks/bench_escape.py
+#
+# python benchmarks/bench_escape.py              escaping in the renderer compared with escaping by hand
+# python benchmarks/bench_escape.py --repeat 9   timed runs per case, the best is kept
+
+from typing import Any, Callable, Dict, List
+import argparse
+import html
+import sys
+import time
+sys.path.insert(0, '.')
+
+from pyhtml import *
+from pyhtml.markup import Markup, escape, escape_attribute
+
+# User content: mostly plain text, some of it with characters to escape.
+VALUES = [f'comment {index}' if index % 4 else f'<b>{index}</b> & "quoted"' for index in range(10_000)]
+STYLES = ['color:var(--color-tertiary);', 'background-color:var(--color-secondary);'] * 5_000
+
+def by_hand() -> str:
+    # What pages did before the renderer escaped: escape every value, and mark
+    # it as Markup so it is not escaped again.
+    return Column(children=[
+        Text(title=Markup(html.escape(value)), children=Markup(html.escape(value, quote=False)))
+        for value in VALUES
+    ]).render()
+
+def by_renderer() -> str:
+    return Column(children=[Text(title=value, children=value) for value in VALUES]).render()
+
+def trusted() -> str:
+    # Fragments already escaped, which used to be escaped a second time.
+    fragments = [Markup(f'<i>{index}</i>') for index in range(10_000)]
+    return Column(children=[Text(children=fragment) for fragment in fragments]).render()
+
+def values_by_hand() -> List[str]:
+    return [html.escape(value) for value in STYLES]
+
+def values_uncached() -> List[str]:
+    return [escape(value) for value in STYLES]
+
+def values_cached() -> List[str]:
+    return [escape_attribute(value) for value in STYLES]
+
+CASES: Dict[str, Callable[[], Any]] = {
+    'page, escaped by hand': by_hand,
+    'page, escaped by render': by_renderer,
+    'page, Markup fragments': trusted,
+    'styles, html.escape': values_by_hand,
+    'styles, escape': values_uncached,
+    'styles, escape_attribute': values_cached,
+}
+
+def best(func: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='pyhtml escaping')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case, the best is kept')
+    args = parser.parse_args()
+
+    assert by_hand() == by_renderer(), 'the renderer escapes differently from html.escape'
+    for name, func in CASES.items():
+        print(f'{name:<28}{best(func, args.repeat) * 1e3:>10.2f} ms')
@@ -0,0 +1,84 @@
+# benchmarks/bench_import.py
+#
+# python benchmarks/bench_import.py               import times of pyhtml, in a fresh interpreter each run
+# python benchmarks/bench_import.py --budget 40   exit with status 1 when `import pyhtml` or
+#                                                 `from pyhtml import *` takes over 40 ms
+
+from typing import Dict, List, Tuple
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The statements held to --budget: importing the package, and the star import
+# the README and examples use.
+BUDGETED = ('import pyhtml', 'from pyhtml import *')
+
+STATEMENTS = {
+    'import pyhtml': 'import pyhtml',
+    'from pyhtml import *': 'from pyhtml import *',
+    'first page': 'from pyhtml import HTML, Text; HTML(children=[Text(children="x")]).render()',
+}
+
+def _imports(statement: str) -> List[Tuple[str, int, int]]:
+    '''
+    Run statement in a fresh interpreter with -X importtime and return every
+    module imported as (name, self, cumulative) microseconds, the name indented
+    by its depth.
+    '''
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((name[1:].rstrip(), int(own), int(cumulative)))
+    return modules
+
+# The modules the interpreter imports at startup, before the statement runs.
+STARTUP = {name for name, _, _ in _imports('pass') if not name.startswith(' ')}
+
+def importtime(statement: str) -> Tuple[int, List[Tuple[str, int, int]]]:
+    '''
+    Return the cumulative microseconds the imports of statement take, and
+    every module imported as (name, self, cumulative) microseconds.
+    '''
+    modules = _imports(statement)
+    # Top-level entries (no indentation) are what the statement itself imported,
+    # including the modules pyhtml imports lazily, e.g. on a star import.
+    total = sum(cumulative for name, _, cumulative in modules if not name.startswith(' ') and name not in STARTUP)
+    return total, modules
+
+def measure(statement: str, repeat: int) -> Tuple[float, List[Tuple[str, int, int]]]:
+    runs = [importtime(statement) for _ in range(repeat)]
+    totals = [total for total, _ in runs]
+    median = statistics.median(totals)
+    return median / 1e3, min(runs, key=lambda run: abs(run[0] - median))[1]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='pyhtml import time')
+    parser.add_argument('--repeat', type=int, default=9, help='fresh interpreters per statement, the median is kept')
+    parser.add_argument('--budget', type=float, default=None, help='fail when import pyhtml or the star import takes more milliseconds')
+    parser.add_argument('--top', type=int, default=8, help='slowest modules to list for each statement')
+    args = parser.parse_args()
+
+    results: Dict[str, float] = {}
+    for label, statement in STATEMENTS.items():
+        milliseconds, modules = measure(statement, args.repeat)
+        results[label] = milliseconds
+        print(f'{label:<24}{milliseconds:>10.2f} ms')
+        for name, own, _ in sorted(modules, key=lambda module: module[1], reverse=True)[:args.top]:
+            print(f'    {name.strip():<32}{own / 1e3:>8.2f} ms self')
+
+    if args.budget is not None:
+        over = [label for label in BUDGETED if results[label] > args.budget]
+        for label in over:
+            print(f'{label} takes {results[label]:.2f} ms, over the budget of {args.budget:.2f} ms')
+        if over:
+            sys.exit(1)
@@ -0,0 +1,47 @@
+# benchmarks/bench_memory.py
+
+import sys
+import tracemalloc
+sys.path.insert(0, '.')
+
+from pyhtml import *
+
+class DictNode:
+    '''
+    The previous node layout: a __dict__ plus a list and a dict per node.
+    '''
+    def __init__(self, **kwargs) -> None:
+        self._tag = kwargs.get('tag', 'div').lower()
+        self._children = kwargs.get('children', [])
+        self._class_names = kwargs.get('class_names', [])
+        self._attrs = {}
+        for key, value in kwargs.items():
+            if key in ['tag', 'children', 'class_names']:
+                continue
+            self._attrs[key] = value
+
+def per_node(factory, count: int = 100_000) -> float:
+    tracemalloc.start()
+    nodes = [factory() for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del nodes
+    return size / count
+
+CASES = {
+    'td': (lambda: Base(tag='td'), lambda: DictNode(tag='td')),
+    'Text': (
+        lambda: Text(children='cell'),
+        lambda: DictNode(tag='p', style='color:var(--color-tertiary);', children='cell'),
+    ),
+    'Option': (
+        lambda: Option(value='item'),
+        lambda: DictNode(tag='option', class_names=[], value='item', children='Item'),
+    ),
+}
+
+if __name__ == '__main__':
+    print(f'{"node":<8}{"bytes/node":>12}{"dict layout":>14}{"saved":>8}')
+    for name, (current, previous) in CASES.items():
+        now, before = per_node(current), per_node(previous)
+        print(f'{name:<8}{now:>12.1f}{before:>14.1f}{1 - now / before:>8.0%}')
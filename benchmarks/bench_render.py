@@ -0,0 +1,55 @@
+# benchmarks/bench_render.py
+
+import sys
+import time
+sys.path.insert(0, '.')
+
+from pyhtml import *
+
+def recursive_to_str(node, indent_level: int = 0) -> str:
+    '''
+    The previous recursive Base._to_str, kept as a reference point.
+    '''
+    indent = '  ' * indent_level
+    inner_html = ''
+    if isinstance(node.children, str):
+        inner_html = f"{'  ' * (indent_level + 1)}{node.children}\n"
+    elif isinstance(node.children, list):
+        inner_html = ''.join(recursive_to_str(child, indent_level + 1) for child in node.children)
+    if inner_html:
+        return f"{indent}{node._start_tag()}\n{inner_html}{indent}</{node.tag}>\n"
+    return f"{indent}{node._start_tag()}</{node.tag}>\n"
+
+def wide_tree(count: int) -> Base:
+    return Column(children=[Row(children=[Text(children=f'row {i}')]) for i in range(count // 2)])
+
+def deep_tree(depth: int) -> Base:
+    node = Text(children='leaf')
+    for _ in range(depth):
+        node = Base(tag='div', children=[node])
+    return node
+
+def measure(func, node, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(node)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def report(name: str, size: int, node: Base) -> None:
+    current = measure(str, node)
+    try:
+        previous = f'{measure(recursive_to_str, node) * 1e6 / size:8.3f}'
+    except RecursionError:
+        previous = 'RecursionError'
+    print(f'{name:<6}{size:>9}{current * 1e3:>12.2f}{current * 1e6 / size:>12.3f}{previous:>16}')
+
+if __name__ == '__main__':
+    print(f'{"tree":<6}{"nodes":>9}{"total ms":>12}{"us/node":>12}{"old us/node":>16}')
+    for count in [1_000, 10_000, 100_000, 400_000]:
+        report('wide', count, wide_tree(count))
+    # Output size of a deep tree grows with the square of its depth because of
+    # indentation, so the per-node cost rises slowly with depth.
+    for depth in [100, 500, 900, 2_000, 5_000]:
+        report('deep', depth, deep_tree(depth))
@@ -0,0 +1,44 @@
+# benchmarks/bench_styles.py
+
+import sys
+import time
+sys.path.insert(0, '.')
+
+from pyhtml import *
+
+def throughput(factory, count: int = 100_000) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        factory()
+    return count / (time.perf_counter() - start)
+
+CASES = {
+    'Button()': lambda: Button(),
+    'Button(class_names)': lambda: Button(class_names=['bg-blue-400', 'text-white']),
+    'Row()': lambda: Row(),
+    'Column()': lambda: Column(),
+    'Input()': lambda: Input(type='text'),
+    'Anchor()': lambda: Anchor(href='/'),
+    'Styles chain': lambda: Styles().flex('row').justify('center').items('center').gap(2).rounded('lg').to_list(),
+    'ResponsiveStyles': lambda: ResponsiveStyles(base=Styles().flex('col'), md=Styles().flex('row').gap(4)).to_list(),
+}
+
+def long_chain(size: int) -> float:
+    '''
+    Seconds to insert size distinct classes and then each of them again.
+    '''
+    start = time.perf_counter()
+    styles = Styles()
+    for _ in range(2):
+        for index in range(size):
+            styles.other(f'w-{index}')
+    return time.perf_counter() - start
+
+if __name__ == '__main__':
+    print(f'{"construction":<22}{"per second":>14}')
+    for name, factory in CASES.items():
+        print(f'{name:<22}{throughput(factory):>14,.0f}')
+    print()
+    print(f'{"classes in Styles":<22}{"ms":>14}')
+    for size in [100, 1_000, 10_000]:
+        print(f'{size:<22}{long_chain(size) * 1e3:>14.2f}')
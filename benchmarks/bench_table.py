@@ -0,0 +1,93 @@
+# benchmarks/bench_table.py
+#
+# python benchmarks/bench_table.py               Table compared with an element per cell
+# python benchmarks/bench_table.py --rows 100000 rows of the report
+
+from typing import Any, Callable, Dict, List, Tuple
+from array import array
+import argparse
+import sys
+import time
+import tracemalloc
+sys.path.insert(0, '.')
+
+from pyhtml import *
+from pyhtml.table import Table
+
+def report(rows: int) -> Dict[str, Any]:
+    return {
+        'id': array('q', range(rows)),
+        'customer': [f'Customer {index % 977} & Sons' for index in range(rows)],
+        'quantity': array('q', (index % 13 for index in range(rows))),
+        'price': array('d', (index * 0.37 for index in range(rows))),
+        'status': ['paid' if index % 3 else 'due' for index in range(rows)],
+    }
+
+FORMATTERS = {'id': '06d', 'price': ',.2f'}
+
+def _cell(name: str, value: Any) -> str:
+    formatter = FORMATTERS.get(name)
+    return str(value) if formatter is None else format(value, formatter)
+
+def node_per_cell(columns: Dict[str, Any]) -> str:
+    # How reports are built without Table: a Row per row and a Text per cell.
+    names = list(columns)
+    return Column(children=[Row(children=[Text(children=name) for name in names])] + [
+        Row(children=[Text(children=_cell(name, columns[name][index])) for name in names])
+        for index in range(len(columns['id']))
+    ]).render()
+
+def table_elements(columns: Dict[str, Any]) -> str:
+    # The markup of Table, built as elements.
+    names = list(columns)
+    return Base(tag='table', style='color:var(--color-tertiary);', children=[
+        Base(tag='thead', children=[Base(tag='tr', children=[Base(tag='th', children=name) for name in names])]),
+        Base(tag='tbody', children=[
+            Base(tag='tr', children=[Base(tag='td', children=_cell(name, columns[name][index])) for name in names])
+            for index in range(len(columns['id']))
+        ]),
+    ]).render()
+
+def columnar(columns: Dict[str, Any]) -> str:
+    return Table(columns, FORMATTERS).render()
+
+def columnar_stream(columns: Dict[str, Any]) -> int:
+    return sum(map(len, Table(columns, FORMATTERS).iter_render()))
+
+CASES: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    'Row and Text per cell': node_per_cell,
+    'element per cell': table_elements,
+    'Table': columnar,
+    'Table, streamed': columnar_stream,
+}
+
+def measure(func: Callable[[Dict[str, Any]], Any], columns: Dict[str, Any], repeat: int) -> Tuple[float, int]:
+    '''
+    Return the best time in seconds, building and rendering, and the peak memory
+    in bytes of one more run.
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(columns)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func(columns)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='pyhtml Table')
+    parser.add_argument('--rows', type=int, default=20_000, help='rows of the report')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case, the best is kept')
+    args = parser.parse_args()
+
+    columns = report(args.rows)
+    assert columnar(columns) == table_elements(columns), 'Table renders differently from its elements'
+    print(f'{args.rows} rows of {len(columns)} columns')
+    for name, func in CASES.items():
+        seconds, peak = measure(func, columns, args.repeat)
+        print(f'{name:<24}{seconds * 1e3:>10.2f} ms{peak / 2**20:>10.1f} MiB')
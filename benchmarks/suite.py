@@ -0,0 +1,276 @@
+# benchmarks/suite.py
+#
+# python benchmarks/suite.py                       run every case and print a table
+# python benchmarks/suite.py --json results.json   also write the results as JSON
+# python benchmarks/suite.py --compare base.json   flag cases slower or bigger than base.json
+#
+# The CHECKS run before the cases on every run, whatever -k selects, and a
+# failing check exits with status 1.
+
+from typing import Any, Callable, Dict, Tuple
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.insert(0, '.')
+
+from pyhtml import *
+from pyhtml.binary import dumps, loads
+from pyhtml.cache import RenderCache
+from pyhtml.patch import diff
+from pyhtml.template import Slot, compile_template
+
+def wide_tree(count: int) -> Base:
+    return Row(children=[Text(children=f'item {index}') for index in range(count)])
+
+def lazy_tree(count: int) -> Base:
+    return Row(children=(Text(children=f'item {index}') for index in range(count)))
+
+async def _row(index: int) -> Base:
+    return Text(children=f'item {index}')
+
+def stream_tasks(count: int) -> str:
+    # Rows whose whole children are tasks, most of them already done when the
+    # stream reaches them; a task is pending, not lazy, children.
+    async def run() -> str:
+        tasks = [asyncio.ensure_future(_row(index)) for index in range(count)]
+        await asyncio.sleep(0)
+        page = Column(children=[Row(children=task) for task in tasks])
+        return ''.join([chunk async for chunk in page.stream_async()])
+    return asyncio.run(run())
+
+def deep_tree(depth: int) -> Base:
+    node = Text(children='leaf')
+    for _ in range(depth):
+        node = Base(tag='div', children=[node])
+    return node
+
+def widget_page(count: int) -> HTML:
+    return HTML(children=[
+        SelectTheme(),
+        Column(children=[ToggleButton(value=f'option {index}') for index in range(count)]),
+    ])
+
+def styles_chain() -> list:
+    return Styles().flex('row').justify('center').items('center').gap(2).rounded('lg') \
+        .p('2.5').bg('gray-200').text('sm').font('medium').w('full').to_list()
+
+def responsive_chain() -> list:
+    return ResponsiveStyles(
+        base=Styles().flex('col').gap(2),
+        sm=Styles().flex('row'),
+        md=Styles().gap(4).p(4),
+        lg=Styles().w('1/2'),
+    ).to_list()
+
+def save_pages(count: int) -> Callable[[], None]:
+    pages = [HTML(title=f'Page {index}', children=[wide_tree(50)]) for index in range(count)]
+    directory = tempfile.mkdtemp()
+
+    def run() -> None:
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            for index, page in enumerate(pages):
+                page.save(f'page_{index}.html')
+        finally:
+            os.chdir(cwd)
+    return run
+
+def _prepared(factory: Callable[[], Any], action: Callable[[Any], Any]) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        value = factory()
+        return lambda: action(value)
+    return setup
+
+def _repeated(func: Callable[[], Any], count: int) -> Callable[[], Callable[[], None]]:
+    def run() -> None:
+        for _ in range(count):
+            func()
+    return lambda: run
+
+# name: setup returning the function to measure. The setup is not measured.
+CASES: Dict[str, Callable[[], Callable[[], Any]]] = {
+    'construct wide 10k': lambda: lambda: wide_tree(10_000),
+    'construct deep 2k': lambda: lambda: deep_tree(2_000),
+    'construct widgets 200': lambda: lambda: widget_page(200),
+    'construct head x1k': _repeated(Head, 1_000),
+    'render wide 10k': _prepared(lambda: wide_tree(10_000), lambda node: node.render()),
+    'render deep 2k': _prepared(lambda: deep_tree(2_000), lambda node: node.render()),
+    'render widgets 200': _prepared(lambda: widget_page(200), lambda node: node.render()),
+    'load binary widgets 200': _prepared(lambda: dumps(widget_page(200)), loads),
+    'render minify wide 10k': _prepared(lambda: wide_tree(10_000), lambda node: node.render(minify=True)),
+    'stream wide 10k': _prepared(lambda: wide_tree(10_000), lambda node: sum(map(len, node.iter_render()))),
+    'stream lazy 10k': lambda: lambda: sum(map(len, lazy_tree(10_000).iter_render())),
+    'stream tasks 1k': lambda: lambda: stream_tasks(1_000),
+    'styles chain x10k': _repeated(styles_chain, 10_000),
+    'responsive chain x10k': _repeated(responsive_chain, 10_000),
+    'save 100 pages': lambda: save_pages(100),
+}
+
+def check_shared_subtree() -> None:
+    # A subtree in two trees: a change in it reaches the cached markup of both.
+    shared = Row(children=[Text(children='shared')])
+    pages = [Column(children=[shared]), Column(children=[shared])]
+    cache = RenderCache(min_nodes=1)
+    for page in pages:
+        page.render(cache=cache)
+    shared.children[0].set('data-y', '1')
+    for page in pages:
+        assert page.render(cache=cache) == page.render(), 'a cached tree holding a shared subtree went stale'
+
+def check_tuple_children() -> None:
+    # Children given as a tuple render, and reading them does not change the markup.
+    node = Base(tag='ul', children=(Base(tag='li', children='item'),))
+    before = str(node)
+    node.children
+    assert '<li>' in before and str(node) == before, 'tuple children rendered differently once read'
+
+def check_stream_tasks() -> None:
+    # Futures and tasks as children are awaited and their results rendered.
+    assert stream_tasks(10).count('<p') == 10, 'the results of tasks were dropped'
+
+def check_stream_repeated() -> None:
+    # One async callable used twice is called once per occurrence and both are placed.
+    calls = []
+
+    async def rows() -> Base:
+        calls.append(None)
+        return Text(children='row')
+
+    async def run() -> None:
+        page = Column(children=[rows, rows])
+        text = ''.join([chunk async for chunk in page.stream_async()])
+        assert len(calls) == 2 and text.count('<p') == 2, 'a repeated pending child was called again'
+        assert all(isinstance(child, Base) for child in page.children), 'a repeated pending child was not placed'
+    asyncio.run(run())
+
+def check_behavior_scripts() -> None:
+    # Elements with a behavior ship its script outside a document too, once.
+    assert str(ToggleButton()).count('<script>') == 1, 'a component outside a Body lost its script'
+    page = HTML(children=[ToggleButton(), ToggleButton()])
+    assert page.render().count('<script>') == 1, 'a document wrote a behavior script twice'
+    patches = diff(Column(children=[]), Column(children=[ToggleButton()]))
+    assert patches[-1].op == 'script', 'a diff inserting a component lost its script'
+
+def check_theme_binding() -> None:
+    # pyhtml.theme is the default Theme, so str(theme) is its CSS.
+    assert isinstance(theme, Theme) and ':root' in str(theme), 'pyhtml.theme is not the default theme'
+
+def check_template_raw_slots() -> None:
+    # Slots in scripts are written as the renderer writes scripts, without escaping.
+    template = compile_template(str(Column(children=[Script(children=Slot('js')), Text(children=Slot('text'))])))
+    text = template(js='var a = 1 < 2;', text='1 < 2')
+    assert 'var a = 1 < 2;' in text and '1 &lt; 2' in text, 'a template escaped a slot as the renderer does not'
+
+# name: function raising AssertionError when the behavior it checks is broken.
+CHECKS: Dict[str, Callable[[], None]] = {
+    'cache shared subtree': check_shared_subtree,
+    'tuple children': check_tuple_children,
+    'stream tasks': check_stream_tasks,
+    'stream repeated pending': check_stream_repeated,
+    'behavior scripts': check_behavior_scripts,
+    'theme binding': check_theme_binding,
+    'template raw slots': check_template_raw_slots,
+}
+
+def check() -> int:
+    '''
+    Run every check, print the ones that fail and return how many there are.
+    '''
+    failures = 0
+    for name, func in CHECKS.items():
+        try:
+            func()
+        except AssertionError as error:
+            print(f'check {name} failed: {error}')
+            failures += 1
+    return failures
+
+def measure(setup: Callable[[], Callable[[], Any]], repeat: int) -> Tuple[float, int]:
+    '''
+    Return the best time in seconds over repeat runs, and the peak memory in
+    bytes allocated by one more run, traced separately so tracing does not
+    slow down the timed runs.
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        func = setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    func = setup()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+def run(selected: str = '', repeat: int = 5) -> Dict[str, Any]:
+    results = {}
+    for name, setup in CASES.items():
+        if selected and selected not in name:
+            continue
+        seconds, peak = measure(setup, repeat)
+        results[name] = {'seconds': seconds, 'peak_bytes': peak}
+        print(f'{name:<26}{seconds * 1e3:>12.2f} ms{peak / 1024:>12.0f} KiB', flush=True)
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> int:
+    '''
+    Print the cases that got slower or use more memory than the baseline by more
+    than tolerance, and return how many there are.
+    '''
+    regressions = 0
+    print(f'\n{"compared to baseline":<26}{"time":>12}{"memory":>15}')
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            print(f'{name:<26}{"new":>12}')
+            continue
+        time_ratio = result['seconds'] / before['seconds'] if before['seconds'] else 1.0
+        memory_ratio = result['peak_bytes'] / before['peak_bytes'] if before['peak_bytes'] else 1.0
+        flag = ''
+        if time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance:
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f'{name:<26}{time_ratio:>11.2f}x{memory_ratio:>14.2f}x{flag}')
+    return regressions
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='pyhtml benchmark suite')
+    parser.add_argument('-k', dest='selected', default='', help='only run the cases whose name contains this')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case, the best is kept')
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='baseline results to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='allowed slowdown before flagging, 0.10 is 10%%')
+    args = parser.parse_args()
+
+    failures = check()
+    if failures:
+        sys.exit(1)
+    print(f'{"case":<26}{"best":>15}{"peak":>16}')
+    current = run(args.selected, args.repeat)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(current, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print(f'\n{regressions} regression(s) beyond {args.tolerance:.0%}')
+            sys.exit(1)
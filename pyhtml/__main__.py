@@ -0,0 +1,37 @@
+# pyhtml/__main__.py
+
+from typing import List
+from time import perf_counter
+import argparse
+import os
+import sys
+from .build import build_pages
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m pyhtml')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='render the pages of modules into a directory')
+    build.add_argument('sources', nargs='+', help='page modules: .py files, directories of them or dotted names')
+    build.add_argument('-o', '--out', default='templates', help='output directory (default: templates)')
+    build.add_argument('-j', '--workers', type=int, default=None, help='worker processes (default: one per CPU)')
+    build.add_argument('--minify', action='store_true', help='render without indentation and line breaks')
+    build.add_argument('--top', type=int, default=10, help='number of slowest pages to list, 0 for all (default: 10)')
+    args = parser.parse_args(argv)
+
+    # Dotted module names are imported relative to the current directory.
+    sys.path.insert(0, os.getcwd())
+    start = perf_counter()
+    manifest, timings = build_pages(args.sources, args.out, workers=args.workers, minify=args.minify)
+    elapsed = perf_counter() - start
+
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)
+    if args.top:
+        slowest = slowest[:args.top]
+    for filename, seconds in slowest:
+        print(f'{seconds * 1000:10.2f} ms  {filename}')
+    rate = len(timings) / elapsed if elapsed else 0
+    print(f'Built {len(timings)} pages in {elapsed:.2f} s ({rate:.0f} pages/s): {manifest.report()}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
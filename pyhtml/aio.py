@@ -0,0 +1,132 @@
+# pyhtml/aio.py
+
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from inspect import isawaitable
+import asyncio
+from .renderer import Renderer, Pending, as_children, as_content, is_pending
+
+def _find_pending(parent: Any, roots: List[Any]) -> List[Tuple[Any, Any, bool]]:
+    '''
+    Return (parent, pending, whole) for every pending child in or below roots,
+    the children of parent, in document order, where whole tells whether
+    pending is the entire children value of its parent.
+    '''
+    found = []
+    stack = [(parent, root) for root in reversed(roots)]
+    while stack:
+        parent, node = stack.pop()
+        if not hasattr(node, '_tag'):
+            if is_pending(node):
+                found.append((parent, node, False))
+            continue
+        content = node._children
+        if isinstance(content, list):
+            stack.extend((node, child) for child in reversed(content))
+        elif content is not None and not isinstance(content, (str, tuple)) and is_pending(content):
+            found.append((node, content, True))
+    return found
+
+async def _await(pending: Any) -> Any:
+    if isawaitable(pending):
+        return await pending
+    return await pending()
+
+def _place(parent: Any, pending: Any, whole: bool, result: Any) -> List[Any]:
+    '''
+    Put the result of a pending child into the tree and return the new children.
+    '''
+    if whole:
+        parent._children = as_content(result)
+        children = parent._children if isinstance(parent._children, list) else []
+    else:
+        children = as_children(result)
+        siblings = parent._children
+        index = next(index for index, child in enumerate(siblings) if child is pending)
+        siblings[index:index + 1] = children
+    for child in children:
+        if hasattr(child, '_tag'):
+            parent._adopt(child)
+    parent._invalidate()
+    return children
+
+async def resolve(node: Any) -> Any:
+    '''
+    Await every pending child of the tree concurrently and put the results in
+    place. Results that contain pending children themselves are resolved in
+    the next round, until the tree has none left.
+    '''
+    found = _find_pending(None, [node])
+    while found:
+        results = await asyncio.gather(*(_await(pending) for _, pending, _ in found))
+        placed = [
+            (parent, _place(parent, pending, whole, result))
+            for (parent, pending, whole), result in zip(found, results)
+        ]
+        found = [item for parent, children in placed for item in _find_pending(parent, children)]
+    return node
+
+async def render_async(node: Any, indent_level: int = 0, **options) -> str:
+    '''
+    Resolve the pending children of node concurrently, then render it. The
+    options are those of Renderer. Lazy children are not resolved, awaitables
+    among them can only be rendered by stream_async.
+    '''
+    await resolve(node)
+    return Renderer(**options).render(node, indent_level)
+
+async def stream_async(node: Any, chunk_size: int = 4096, indent_level: int = 0, **options) -> AsyncIterator[str]:
+    '''
+    Yield the markup of node in chunks while its pending children are awaited
+    concurrently. Everything before the first unresolved child is sent right
+    away; each pending child is awaited only when the output reaches it.
+    '''
+    # The same pending child can occur several times, e.g. one async callable
+    # used twice in a list, so each occurrence has its own task. They are
+    # scheduled in document order and taken in the order the output meets them.
+    tasks: Dict[int, List[Tuple[Any, Any, bool, asyncio.Future]]] = {}
+
+    def schedule(parent: Any, roots: List[Any]) -> None:
+        for parent, pending, whole in _find_pending(parent, roots):
+            task = asyncio.ensure_future(_await(pending))
+            tasks.setdefault(id(pending), []).append((parent, pending, whole, task))
+
+    renderer = Renderer(chunk_size=chunk_size, **options)
+    renderer._resolving = True
+    schedule(None, [node])
+
+    buffer = []
+    walk = renderer._walk((node,), indent_level, buffer)
+    placements = []
+    try:
+        value = None
+        while True:
+            try:
+                item = walk.send(value)
+            except StopIteration:
+                break
+            value = None
+            if isinstance(item, Pending):
+                occurrences = tasks.get(id(item.value))
+                if not occurrences:
+                    # Met in lazy children, which cannot be searched ahead.
+                    value = await _await(item.value)
+                    continue
+                parent, pending, whole, task = occurrences.pop(0)
+                if not occurrences:
+                    del tasks[id(item.value)]
+                value = await task
+                placements.append((parent, pending, whole, value))
+                if not isinstance(value, str):
+                    schedule(parent, as_children(value))
+            else:
+                yield item
+        if buffer:
+            yield ''.join(buffer)
+    finally:
+        for occurrences in tasks.values():
+            for _, _, _, task in occurrences:
+                task.cancel()
+        # The engine renders results where it meets them, the tree is only
+        # updated once it no longer iterates over the children lists.
+        for parent, pending, whole, result in placements:
+            _place(parent, pending, whole, result)
@@ -0,0 +1,29 @@
+# pyhtml/behaviors.py
+
+from typing import Dict, Iterable, Tuple
+from .minify import Code
+
+_SCRIPTS: Dict[str, Code] = {}
+_COMBINED: Dict[Tuple[str, ...], Code] = {}
+
+def register(name: str, script: str) -> str:
+    '''
+    Register the script of a behavior. A component class with _behavior = name
+    marks its elements with data- attributes and ships no script of its own;
+    the script handles every such element through event delegation, and is
+    written once per document at the end of Body when the page uses it, or
+    at the end of a render of elements outside a Body.
+    '''
+    _SCRIPTS[name] = Code(script)
+    _COMBINED.clear()
+    return name
+
+def scripts(names: Iterable[str]) -> Code:
+    '''
+    Return the scripts of the given behaviors as one block, memoized per set.
+    '''
+    names = tuple(names)
+    code = _COMBINED.get(names)
+    if code is None:
+        code = _COMBINED[names] = Code(''.join(_SCRIPTS[name] for name in names))
+    return code
@@ -0,0 +1,362 @@
+# pyhtml/binary.py
+
+# A compact format for trees built ahead of time, loaded without running their
+# constructors and without pickle:
+#
+#   magic 'PYHT', version, string count, string bytes    4 x uint32
+#   string offsets                                       (count + 1) x uint32
+#   strings, UTF-8, padded to 4 bytes
+#   words                                                uint32 until the end
+#
+# Every string (tags, class names, attribute names and values, text) is stored
+# once and referenced by its index. The words hold the tables of component
+# classes, class name tuples, attribute tuples, auto ids, code blocks and node
+# shapes, then the nodes of the tree in document order. A shape is the class,
+# tag, class names and attributes of a node, which components repeat, so a
+# node is its shape and its children. Integers are little-endian.
+
+from typing import Any, Dict, List, Tuple, Union
+from array import array
+from sys import byteorder, intern
+import importlib
+import mmap
+import struct
+from .ids import AutoId
+from .markup import Markup
+from .minify import Code
+
+MAGIC = b'PYHT'
+VERSION = 1
+_HEADER = struct.Struct('<4sIII')
+
+# Attribute values
+_STR, _INT, _FLOAT, _TRUE, _FALSE, _NONE, _AUTO, _SAFE = range(8)
+# Children, and the items of a list of children
+_TEXT, _CODE, _NODE, _LIST, _EMPTY, _NOTHING, _MARKUP = range(7)
+
+class _Writer:
+    def __init__(self) -> None:
+        self.strings: Dict[str, int] = {}
+        self.types: Dict[type, int] = {}
+        self.tuples: Dict[Tuple[str, ...], int] = {}
+        self.attributes: Dict[Tuple[Tuple[str, int, int], ...], int] = {}
+        self.shapes: Dict[Tuple[int, int, int, int], int] = {}
+        self.auto_ids: Dict[int, int] = {}
+        self.auto_prefixes: List[int] = []
+        self.codes: Dict[Tuple[str, str], int] = {}
+        self.words = array('I')
+
+    def string(self, text: str) -> int:
+        index = self.strings.get(text)
+        if index is None:
+            index = self.strings[text] = len(self.strings)
+        return index
+
+    def value(self, value: Any) -> Tuple[int, int]:
+        if value.__class__ is str:
+            return _STR, self.string(value)
+        if value.__class__ is AutoId:
+            index = self.auto_ids.get(id(value))
+            if index is None:
+                index = self.auto_ids[id(value)] = len(self.auto_prefixes)
+                self.auto_prefixes.append(self.string(value.prefix))
+            return _AUTO, index
+        if value is True or value is False:
+            return (_TRUE if value else _FALSE), 0
+        if value is None:
+            return _NONE, 0
+        if isinstance(value, int):
+            return _INT, self.string(str(int(value)))
+        if isinstance(value, float):
+            return _FLOAT, self.string(repr(value))
+        if hasattr(value, '__html__') and isinstance(value, str):
+            return _SAFE, self.string(str(value))
+        if isinstance(value, str):
+            return _STR, self.string(str(value))
+        raise ValueError(f'Cannot serialize the attribute value {value!r}')
+
+    def code(self, code: Code) -> int:
+        key = (str(code), code.language)
+        index = self.codes.get(key)
+        if index is None:
+            index = self.codes[key] = len(self.codes)
+        return index
+
+    def node(self, root: Any) -> None:
+        '''
+        Append the words of the subtree of root.
+        '''
+        words = self.words
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.__class__ is Code:
+                words.extend((_CODE, self.code(node)))
+                continue
+            if isinstance(node, str):
+                words.extend((_MARKUP if hasattr(node, '__html__') else _TEXT, self.string(str(node))))
+                continue
+            if not hasattr(node, '_tag'):
+                raise ValueError(f'Cannot serialize the child {node!r}, only elements and strings')
+            if getattr(node, '__dict__', None):
+                raise ValueError(f'Cannot serialize {type(node).__qualname__}, its instances have attributes besides the slots of Base')
+
+            kind = type(node)
+            type_index = self.types.get(kind)
+            if type_index is None:
+                type_index = self.types[kind] = len(self.types)
+            class_names = tuple(node._class_names)
+            names_index = 0
+            if class_names:
+                names_index = self.tuples.get(class_names)
+                if names_index is None:
+                    names_index = self.tuples[class_names] = len(self.tuples) + 1
+            attrs = tuple((self.string(key),) + self.value(value) for key, value in node._attr_items())
+            attrs_index = 0
+            if attrs:
+                attrs_index = self.attributes.get(attrs)
+                if attrs_index is None:
+                    attrs_index = self.attributes[attrs] = len(self.attributes) + 1
+            shape = (type_index, self.string(node._tag), names_index, attrs_index)
+            shape_index = self.shapes.get(shape)
+            if shape_index is None:
+                shape_index = self.shapes[shape] = len(self.shapes)
+            words.extend((_NODE, shape_index))
+
+            content = node._children
+            if content is None:
+                words.append(_NOTHING)
+            elif content.__class__ is tuple and not content:
+                words.append(_EMPTY)
+            elif content.__class__ is Code:
+                words.extend((_CODE, self.code(content)))
+            elif isinstance(content, str):
+                words.extend((_MARKUP if hasattr(content, '__html__') else _TEXT, self.string(str(content))))
+            elif isinstance(content, (list, tuple)):
+                words.extend((_LIST, len(content)))
+                stack.extend(reversed(content))
+            else:
+                raise ValueError(f'Cannot serialize the children {content!r} of {node._tag}, only elements and strings')
+
+    def tables(self) -> array:
+        words = array('I')
+        words.append(len(self.types))
+        words.extend(self.string(f'{kind.__module__}:{kind.__qualname__}') for kind in self.types)
+        words.append(len(self.tuples))
+        for names in self.tuples:
+            words.append(len(names))
+            words.extend(self.string(name) for name in names)
+        words.append(len(self.auto_prefixes))
+        words.extend(self.auto_prefixes)
+        words.append(len(self.attributes))
+        for attrs in self.attributes:
+            words.append(len(attrs))
+            for attr in attrs:
+                words.extend(attr)
+        words.append(len(self.codes))
+        for text, language in self.codes:
+            words.extend((self.string(text), self.string(language)))
+        words.append(len(self.shapes))
+        for shape in self.shapes:
+            words.extend(shape)
+        return words
+
+def dumps(root: Any) -> bytes:
+    '''
+    Serialize the tree of root. The children must be elements and strings, and
+    the attribute values strings, Markup, numbers, booleans, None or AutoId; elements
+    are restored as the same class, whose module must be imported where they
+    are loaded unless it is part of pyhtml.
+    '''
+    writer = _Writer()
+    writer.node(root)
+    words = writer.tables() + writer.words
+    encoded = [text.encode('utf-8', 'surrogatepass') for text in writer.strings]
+    offsets = array('I', [0])
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    blob = b''.join(encoded)
+    blob += b'\0' * (-len(blob) % 4)
+    if byteorder != 'little':
+        offsets.byteswap()
+        words.byteswap()
+    return b''.join([_HEADER.pack(MAGIC, VERSION, len(encoded), offsets[-1]), offsets.tobytes(), blob, words.tobytes()])
+
+def _subclasses(base: type) -> Dict[str, type]:
+    classes = {}
+    stack = [base]
+    while stack:
+        kind = stack.pop()
+        classes[f'{kind.__module__}:{kind.__qualname__}'] = kind
+        stack.extend(kind.__subclasses__())
+    return classes
+
+def _class(path: str, classes: Dict[str, type]) -> type:
+    '''
+    Return the element class at path among classes, the subclasses of Base
+    defined so far. Only the modules of pyhtml are imported to find one, so a
+    file cannot make the loader import arbitrary code.
+    '''
+    kind = classes.get(path)
+    if kind is None:
+        module = path.partition(':')[0]
+        if module == 'pyhtml' or module.startswith('pyhtml.'):
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                pass
+            else:
+                from .components import Base
+                classes.update(_subclasses(Base))
+                kind = classes.get(path)
+    if kind is None:
+        raise ValueError(f'{path} is not an element class; import the module defining it before loading')
+    return kind
+
+def loads(data: Union[bytes, memoryview, mmap.mmap]) -> Any:
+    '''
+    Restore a tree serialized by dumps. Element constructors are not called, so
+    loading costs a fraction of building the tree. Equal strings and class name
+    tuples are shared by the elements, as in a tree built by the components.
+    '''
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ValueError('Not a serialized pyhtml tree')
+    magic, version, count, size = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError('Not a serialized pyhtml tree')
+    if version != VERSION:
+        raise ValueError(f'The tree was serialized in version {version} of the format, this is version {VERSION}; serialize it again')
+
+    position = _HEADER.size
+    offsets = array('I')
+    offsets.frombytes(view[position:position + 4 * (count + 1)])
+    position += 4 * (count + 1)
+    if byteorder != 'little':
+        offsets.byteswap()
+    strings = [str(view[position + offsets[index]:position + offsets[index + 1]], 'utf-8', 'surrogatepass') for index in range(count)]
+    position += size + (-size % 4)
+    words = array('I')
+    words.frombytes(view[position:])
+    view.release()
+    if byteorder != 'little':
+        words.byteswap()
+
+    cursor = 0
+    def read(length: int) -> List[int]:
+        nonlocal cursor
+        cursor += length
+        return words[cursor - length:cursor].tolist()
+
+    from .components import Base
+    classes = _subclasses(Base)
+    types = [_class(strings[index], classes) for index in read(read(1)[0])]
+    tuples: List[Tuple[str, ...]] = [()]
+    for _ in range(read(1)[0]):
+        tuples.append(tuple(intern(strings[index]) for index in read(read(1)[0])))
+    auto_ids = [AutoId(strings[index]) for index in read(read(1)[0])]
+    constants = {_TRUE: True, _FALSE: False, _NONE: None}
+    attributes: List[Tuple[Any, ...]] = [()]
+    for _ in range(read(1)[0]):
+        attrs = []
+        for key, value_kind, payload in zip(*[iter(read(3 * read(1)[0]))] * 3):
+            if value_kind == _STR:
+                value = strings[payload]
+            elif value_kind == _AUTO:
+                value = auto_ids[payload]
+            elif value_kind == _INT:
+                value = int(strings[payload])
+            elif value_kind == _FLOAT:
+                value = float(strings[payload])
+            elif value_kind == _SAFE:
+                value = Markup(strings[payload])
+            else:
+                value = constants[value_kind]
+            attrs.append(strings[key])
+            attrs.append(value)
+        attributes.append(tuple(attrs))
+    codes = []
+    for _ in range(read(1)[0]):
+        text, language = read(2)
+        codes.append(Code(strings[text], strings[language]))
+    shapes = []
+    for _ in range(read(1)[0]):
+        type_index, tag, names, attrs = read(4)
+        shapes.append((types[type_index], intern(strings[tag]), tuples[names], attributes[attrs]))
+    words = words[cursor:].tolist()
+
+    root = None
+    # (parent, children left to read) of the elements around parent
+    stack: List[Tuple[Any, int]] = []
+    parent, left = None, 0
+    cursor = 0
+    while True:
+        kind = words[cursor]
+        payload = words[cursor + 1]
+        cursor += 2
+        if kind == _NODE:
+            cls, tag, class_names, attrs = shapes[payload]
+            item = cls.__new__(cls)
+            item._tag = tag
+            item._class_names = class_names
+            item._attrs = attrs
+            item._parent = parent
+            item._key = None
+            item._index = None
+            item._owners = None
+            content = words[cursor]
+            if content == _LIST:
+                length = words[cursor + 1]
+                cursor += 2
+                item._children = []
+                if length:
+                    if parent is None:
+                        root = item
+                    else:
+                        parent._children.append(item)
+                    stack.append((parent, left - 1))
+                    parent, left = item, length
+                    continue
+            elif content == _TEXT:
+                item._children = strings[words[cursor + 1]]
+                cursor += 2
+            elif content == _CODE:
+                item._children = codes[words[cursor + 1]]
+                cursor += 2
+            elif content == _MARKUP:
+                item._children = Markup(strings[words[cursor + 1]])
+                cursor += 2
+            else:
+                item._children = () if content == _EMPTY else None
+                cursor += 1
+        elif kind == _TEXT:
+            item = strings[payload]
+        elif kind == _MARKUP:
+            item = Markup(strings[payload])
+        else:
+            item = codes[payload]
+
+        if parent is None:
+            return item
+        parent._children.append(item)
+        left -= 1
+        while not left:
+            parent, left = stack.pop()
+            if parent is None:
+                return root
+
+def dump(root: Any, path: str) -> None:
+    '''
+    Serialize the tree of root to the file at path, written atomically.
+    '''
+    from .build import write_atomic
+    write_atomic(path, dumps(root))
+
+def load(path: str) -> Any:
+    '''
+    Restore a tree written by dump. The file is memory-mapped and read once;
+    the tree itself is built in the memory of this process.
+    '''
+    with open(path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return loads(mapped)
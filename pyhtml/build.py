@@ -0,0 +1,229 @@
+# pyhtml/build.py
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from types import ModuleType
+from time import perf_counter
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+from .cache import RenderCache
+from .renderer import render
+
+def write_atomic(path: str, text: Union[str, bytes]) -> None:
+    '''
+    Write text, or bytes, to path through a temporary file in the same directory,
+    renamed over path once complete, so readers never see a partially written file.
+    '''
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        if isinstance(text, bytes):
+            file = os.fdopen(fd, 'wb')
+        else:
+            file = os.fdopen(fd, 'w', encoding='utf-8')
+        with file:
+            file.write(text)
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+def content_hash(text: str) -> str:
+    return blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+def _write_changed(path: str, text: str, digest: str, previous: Optional[str]) -> bool:
+    if previous == digest and os.path.isfile(path):
+        return False
+    write_atomic(path, text)
+    return True
+
+class Manifest:
+    def __init__(self, directory: str = 'templates', filename: str = '.manifest.json') -> None:
+        '''
+        The content hashes of the pages written to directory by previous builds.
+        write() only writes a page whose markup changed since, and records
+        whether it was added, changed or unchanged. save() stores the hashes for
+        the next build; it is called on leaving a with block.
+        '''
+        self._directory = directory
+        self._path = os.path.join(directory, filename)
+        self._hashes: Dict[str, str] = {}
+        if os.path.isfile(self._path):
+            with open(self._path, encoding='utf-8') as file:
+                self._hashes = json.load(file)
+        self.added: List[str] = []
+        self.changed: List[str] = []
+        self.unchanged: List[str] = []
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def digest(self, filename: str) -> Optional[str]:
+        '''
+        Return the hash of filename recorded by the last build, if any.
+        '''
+        return self._hashes.get(filename)
+
+    def write(self, filename: str, text: str) -> bool:
+        '''
+        Write text to filename in the directory unless it is unchanged, and
+        return whether it was written.
+        '''
+        digest = content_hash(text)
+        written = _write_changed(os.path.join(self._directory, filename), text, digest, self.digest(filename))
+        self.record(filename, digest, written)
+        return written
+
+    def record(self, filename: str, digest: str, written: bool) -> None:
+        '''
+        Record a page written, or found unchanged, by another process.
+        '''
+        if not written:
+            self.unchanged.append(filename)
+            return
+        (self.added if filename not in self._hashes else self.changed).append(filename)
+        self._hashes[filename] = digest
+
+    def save(self) -> None:
+        write_atomic(self._path, json.dumps(self._hashes, indent=2, sort_keys=True))
+
+    def report(self) -> str:
+        return f'{len(self.added)} added, {len(self.changed)} changed, {len(self.unchanged)} unchanged'
+
+    def __enter__(self) -> 'Manifest':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.save()
+
+    def __repr__(self) -> str:
+        return f'Manifest({self._path!r}, {self.report()})'
+
+def build(pages: Dict[str, Any], directory: str = 'templates', **options) -> Manifest:
+    '''
+    Render every page of {filename: page} and write the ones that changed since
+    the last build to directory. The options are those of Renderer. Return the
+    manifest, whose added, changed and unchanged lists report what happened.
+    '''
+    with Manifest(directory) as manifest:
+        for filename, page in pages.items():
+            manifest.write(filename, render(page, **options))
+    return manifest
+
+# Pages discovered from modules, and the render options with a RenderCache,
+# kept per worker process.
+_PAGES: Dict[str, Any] = {}
+_OPTIONS: Dict[str, Any] = {}
+
+def page(filename: str) -> Callable:
+    '''
+    Mark a function returning an HTML as the factory of the page filename, for
+    discover() and python -m pyhtml build.
+    '''
+    def mark(factory: Callable) -> Callable:
+        factory._pyhtml_page = filename
+        return factory
+    return mark
+
+def _load(source: str) -> ModuleType:
+    if not source.endswith('.py'):
+        return importlib.import_module(source)
+    name = '_pyhtml_pages_' + os.path.splitext(os.path.basename(source))[0]
+    spec = importlib.util.spec_from_file_location(name, source)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def _expand(sources: List[str]) -> List[str]:
+    expanded = []
+    for source in sources:
+        if os.path.isdir(source):
+            expanded.extend(
+                os.path.join(source, name) for name in sorted(os.listdir(source))
+                if name.endswith('.py') and not name.startswith('_')
+            )
+        else:
+            expanded.append(source)
+    return expanded
+
+def discover(*sources: str) -> Dict[str, Any]:
+    '''
+    Import the page modules given as .py files, directories of them or dotted
+    names, and return their pages as {filename: HTML or factory}. A module either
+    defines pages, a dict of them or a function returning one, or has its
+    module-level HTML objects saved as <name>.html and its @page functions
+    under the filename they are marked with.
+    '''
+    from . import HTML
+
+    pages = {}
+    for source in _expand(list(sources)):
+        module = _load(source)
+        declared = getattr(module, 'pages', None)
+        if callable(declared):
+            declared = declared()
+        if isinstance(declared, dict):
+            pages.update(declared)
+            continue
+        for name, value in vars(module).items():
+            if name.startswith('_'):
+                continue
+            if isinstance(value, HTML):
+                pages[f'{name}.html'] = value
+            elif callable(value) and hasattr(value, '_pyhtml_page'):
+                pages[value._pyhtml_page] = value
+    return pages
+
+def _init_worker(sources: List[str], options: Dict[str, Any]) -> None:
+    # Forked workers inherit the pages discovered by the parent process.
+    if not _PAGES:
+        _PAGES.update(discover(*sources))
+    _OPTIONS.clear()
+    _OPTIONS.update(options, cache=RenderCache())
+
+def _build_page(filename: str, previous: Optional[str], directory: str) -> Tuple[str, str, bool, float]:
+    start = perf_counter()
+    page = _PAGES[filename]
+    if callable(page) and not hasattr(page, '_tag'):
+        page = page()
+    text = render(page, **_OPTIONS)
+    digest = content_hash(text)
+    written = _write_changed(os.path.join(directory, filename), text, digest, previous)
+    return filename, digest, written, perf_counter() - start
+
+def build_pages(
+    sources: List[str],
+    directory: str = 'templates',
+    workers: int = None,
+    **options,
+) -> Tuple[Manifest, Dict[str, float]]:
+    '''
+    Discover the pages of sources and render them in a pool of worker processes,
+    each with its own RenderCache, writing the ones that changed to directory.
+    Return the manifest and the seconds spent on each page.
+    '''
+    _PAGES.clear()
+    _PAGES.update(discover(*sources))
+    timings = {}
+    with Manifest(directory) as manifest:
+        tasks = [(filename, manifest.digest(filename), directory) for filename in _PAGES]
+        if workers == 1 or len(tasks) < 2:
+            _init_worker(sources, options)
+            results = [_build_page(*task) for task in tasks]
+        else:
+            chunksize = max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(sources, options)) as executor:
+                results = list(executor.map(_build_page, *zip(*tasks), chunksize=chunksize))
+        for filename, digest, written, seconds in results:
+            manifest.record(filename, digest, written)
+            timings[filename] = seconds
+    return manifest, timings
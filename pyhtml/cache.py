@@ -0,0 +1,122 @@
+# pyhtml/cache.py
+
+from typing import Any, Hashable, Optional, Tuple
+from collections import OrderedDict
+import threading
+from .ids import AutoId
+from .minify import Code
+
+def structural_key(root: Any) -> Optional[Tuple[bytes, int, Tuple[str, ...]]]:
+    '''
+    Return a digest of the tag, class names, attributes and children of root, the
+    number of nodes in the subtree and the behaviors it uses. They are memoized on
+    every node and cleared by set() and add_child(), so an unchanged subtree is
+    hashed once.
+    Subtrees with pending or lazy children or an AutoId have no key and return None.
+    '''
+    if root._key is not None:
+        return root._key
+    try:
+        return _structural_key(root)
+    except (AttributeError, _Uncacheable):
+        return None
+
+class _Uncacheable(Exception):
+    pass
+
+def _structural_key(root: Any) -> Tuple[bytes, int, Tuple[str, ...]]:
+    # Imported here, hashlib loads OpenSSL which is slow for import pyhtml.
+    from hashlib import blake2b
+    stack = [(root, False)]
+    while stack:
+        node, ready = stack.pop()
+        if node._key is not None:
+            continue
+
+        content = node._children
+        if not ready and isinstance(content, list):
+            stack.append((node, True))
+            stack.extend((child, False) for child in content if child._key is None)
+            continue
+
+        digest = blake2b(digest_size=16)
+        head = '\x1f'.join([type(node).__qualname__, node._tag, ' '.join(node._class_names)])
+        items = list(node._attr_items())
+        if any(value.__class__ is AutoId for _, value in items):
+            raise _Uncacheable(node)
+        # Markup values are written as is, so they hash apart from equal text.
+        attrs = '\x1f'.join(f'{key}\x1e{"m" if hasattr(value, "__html__") else "t"}{value}' for key, value in items)
+        digest.update(f'{head}\x1d{attrs}\x1d'.encode('utf-8', 'surrogatepass'))
+
+        count = 1
+        behaviors = () if node._behavior is None else (node._behavior,)
+        if isinstance(content, str):
+            if isinstance(content, Code):
+                digest.update(b'\x1cc')
+            else:
+                digest.update(b'\x1cm' if hasattr(content, '__html__') else b'\x1ct')
+            digest.update(content.encode('utf-8', 'surrogatepass'))
+        elif isinstance(content, list):
+            digest.update(b'\x1cl')
+            for child in content:
+                child_digest, child_count, child_behaviors = child._key
+                digest.update(child_digest)
+                count += child_count
+                if child_behaviors and child_behaviors != behaviors:
+                    behaviors = tuple(dict.fromkeys(behaviors + child_behaviors))
+        elif content is not None and content.__class__ is not tuple:
+            raise _Uncacheable(content)
+        node._key = (digest.digest(), count, behaviors)
+
+    return root._key
+
+class RenderCache:
+    def __init__(self, maxsize: int = 256, min_nodes: int = 6) -> None:
+        '''
+        An LRU cache of rendered subtrees, addressed by their structural key and
+        indent level. Only subtrees of at least min_nodes nodes are cached, so the
+        bookkeeping stays small compared to the markup it saves.
+        '''
+        self._maxsize = maxsize
+        self._min_nodes = min_nodes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def min_nodes(self) -> int:
+        return self._min_nodes
+
+    def get(self, key: Hashable) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key: Hashable, text: str) -> None:
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f'RenderCache(size={len(self)}, maxsize={self._maxsize}, hits={self.hits}, misses={self.misses})'
@@ -0,0 +1,695 @@
+# pyhtml/components.py
+
+from typing import List, Dict, Any, Iterator, AsyncIterator, Tuple, TYPE_CHECKING
+from .themes import theme
+from .styles import Styles
+from .renderer import Renderer, render, iter_render, is_lazy
+from .behaviors import register
+from .ids import AutoId, IdAllocator
+from .markup import _ATTRIBUTES as _ESCAPED_ATTRIBUTES, class_attribute, escape_attribute
+from itertools import chain
+from sys import intern
+from weakref import WeakSet
+import os
+
+if TYPE_CHECKING:
+    from .build import Manifest
+    from .query import TreeIndex
+    from .template import Template
+
+class Base:
+    # Trees can hold hundreds of thousands of nodes, so elements have no __dict__.
+    # Class names and attributes are kept as tuples (attributes as a flat
+    # key, value, key, value tuple) until they are accessed for mutation.
+    # The root of a tree keeps a TreeIndex of its elements in _index once it is queried.
+    # A subtree used in several trees keeps its other parents, weakly, in _owners.
+    __slots__ = ('_tag', '_children', '_class_names', '_attrs', '_parent', '_key', '_index', '_owners', '__weakref__')
+
+    _document = False
+    # The name of a registered behavior whose script the element needs, and
+    # whether the scripts of the document are written at the end of the element.
+    _behavior = None
+    _hoist = False
+
+    def __init__(self, **kwargs) -> None:
+        self._tag = intern(kwargs.pop('tag', 'div').lower())
+        children = kwargs.pop('children', ())
+        # The empty tuple stands for no children until they are accessed, so
+        # children given as a tuple are kept as a list, like any others.
+        if children.__class__ is tuple and children:
+            children = list(children)
+        self._children = children
+        class_names = kwargs.pop('class_names', ())
+        self._class_names = tuple(class_names) if class_names else ()
+        self._attrs = tuple(chain.from_iterable(kwargs.items())) if kwargs else ()
+        self._parent = None
+        self._key = None
+        self._index = None
+        self._owners = None
+        if isinstance(self._children, list):
+            for child in self._children:
+                if isinstance(child, Base):
+                    if child._parent is None:
+                        child._parent = self
+                    else:
+                        child._set_parent(self)
+
+    @property
+    def tag(self) -> str:
+        return self._tag
+
+    @property
+    def children(self) -> Any:
+        if type(self._children) is tuple:
+            self._children = list(self._children)
+        return self._children
+    
+    @property
+    def class_names(self) -> List[str]:
+        if type(self._class_names) is tuple:
+            self._class_names = list(self._class_names)
+        return self._class_names
+
+    @property
+    def attrs(self) -> Dict[str, str]:
+        if type(self._attrs) is tuple:
+            self._attrs = dict(zip(self._attrs[::2], self._attrs[1::2]))
+        return self._attrs
+    
+    def set(self, key: str, value: str) -> None:
+        if key == 'id':
+            index = self._root()._index
+            if index is not None:
+                ids = index.ids
+                if ids.get(self.attrs.get('id')) is self:
+                    del ids[self.attrs['id']]
+                if isinstance(value, str):
+                    ids[value] = self
+        self.attrs[key] = value
+        self._invalidate()
+
+    def add_child(self, child: Any) -> bool:
+        if isinstance(self._children, str):
+            if isinstance(child, str):
+                self._children += child
+                self._invalidate()
+                return True
+            else:
+                print(f'Error - Tag {self._tag}: Cannot add Object into this parent since the content is a string!')
+                return False
+
+        if isinstance(child, str):
+            print(f'Error - Tag {self._tag}: Cannot add a string into this parent since the content is a list of Object!')
+            return False
+        elif is_lazy(self._children):
+            # Lazy children stay lazy, the child is rendered after them.
+            self._children = chain(self._children, (child,))
+            if isinstance(child, Base):
+                child._set_parent(self)
+            return True
+        else:
+            self.children.append(child)
+            if isinstance(child, Base):
+                self._adopt(child)
+            self._invalidate()
+            return True
+
+    def _adopt(self, child: 'Base') -> None:
+        '''
+        Make self, one of whose children is child, the parent of child, and add
+        the subtree of child to the index of the tree if it has one.
+        '''
+        child._set_parent(self)
+        child._index = None
+        # The elements of child come last in the document only if child and
+        # every ancestor of it are the last child of their parent.
+        at_end = self._children[-1] is child
+        node = self
+        while node._parent is not None:
+            if at_end and node._parent._children[-1] is not node:
+                at_end = False
+            node = node._parent
+        if node._index is not None:
+            node._index.add(child, at_end)
+
+    def _set_parent(self, parent: 'Base') -> None:
+        '''
+        Make parent the parent of self. When self is already in another tree,
+        e.g. a nav bar shared by several pages, that parent is kept in _owners,
+        so that _invalidate reaches every tree holding self.
+        '''
+        previous = self._parent
+        if previous is not None and previous is not parent:
+            if self._owners is None:
+                self._owners = WeakSet()
+            self._owners.add(previous)
+        self._parent = parent
+
+    def _root(self) -> 'Base':
+        node = self
+        while node._parent is not None:
+            node = node._parent
+        return node
+
+    def _tree_index(self, ordered: bool = True) -> 'TreeIndex':
+        '''
+        Return the index of the tree, with its lists by tag and class in
+        document order if ordered; lookups by id need no order.
+        '''
+        root = self._root()
+        if root._index is None:
+            from .query import TreeIndex
+            root._index = TreeIndex(root)
+        elif ordered and not root._index.ordered:
+            root._index.order(root)
+        return root._index
+
+    def get_by_id(self, element_id: str) -> 'Base':
+        '''
+        Return the element of the tree with this id, or None. The index is built
+        on the first lookup and kept up to date by add_child and set('id', ...),
+        so later lookups do not walk the tree. Ids of AutoId are not indexed,
+        since they are only numbered when the tree is rendered.
+        '''
+        return self._tree_index(ordered=False).ids.get(element_id)
+
+    def query(self, selector: str) -> 'Base':
+        '''
+        Return the first element below this one that matches selector, or None.
+        See query_all for the selectors supported.
+        '''
+        found = self.query_all(selector, limit=1)
+        return found[0] if found else None
+
+    def query_all(self, selector: str, limit: int = None) -> List['Base']:
+        '''
+        Return the elements below this one that match selector, in document
+        order. Selectors combine a tag or *, .class, #id and [name], [name=value]
+        (also ~=, ^=, $= and *=) with descendant (a b) and child (a > b)
+        combinators. Candidates come from the id, class and tag index of the
+        tree, which is built on the first query and kept up to date by
+        add_child and set, so repeated queries cost about the number of matches.
+        Changes made through the children, class_names and attrs lists directly
+        are not seen by the index, as for RenderCache.
+        '''
+        from .query import select, uses_lists
+        index = self._tree_index(ordered=uses_lists(selector))
+        return select(self, selector, index, self._root(), limit)
+
+    def render_fragment(self, element_id: str, oob: List[str] = (), **options) -> str:
+        '''
+        Return the markup of the element with this id alone, for partial page
+        updates. The elements with the ids in oob follow it with hx-swap-oob, so
+        htmx swaps them into the page as well. The options are those of render.
+        Auto ids inside a fragment are numbered from the fragment, so elements
+        updated this way should be given their ids explicitly. The scripts of
+        the behaviors used by these elements follow the first one.
+        '''
+        node = self.get_by_id(element_id)
+        if node is None:
+            print(f'Error - Tag {self._tag}: No element has the id {element_id}!')
+            return None
+        renderer = Renderer(**options)
+        renderer._partial = True
+        parts = [renderer.render(node)]
+        behaviors = dict(renderer.behaviors)
+        for other_id in oob:
+            other = self.get_by_id(other_id)
+            if other is None:
+                print(f'Error - Tag {self._tag}: No element has the id {other_id}!')
+                continue
+            markup = renderer.render(other)
+            behaviors.update(renderer.behaviors)
+            end = len(other._tag) + 1
+            parts.append(f'{markup[:end]} hx-swap-oob="true"{markup[end:]}')
+        parts.insert(1, renderer.scripts(list(behaviors)))
+        return ''.join(parts)
+
+    def __getstate__(self) -> tuple:
+        # The parent, the memoized key and the index are left out, so pickling a subtree
+        # (e.g. to send it to a worker process) does not pickle the whole tree.
+        return (self._tag, self._children, self._class_names, self._attrs, getattr(self, '__dict__', None))
+
+    def __setstate__(self, state: tuple) -> None:
+        self._tag, self._children, self._class_names, self._attrs, extra = state
+        self._parent = None
+        self._key = None
+        self._index = None
+        self._owners = None
+        if extra:
+            self.__dict__.update(extra)
+        if isinstance(self._children, list):
+            for child in self._children:
+                if isinstance(child, Base):
+                    child._parent = self
+
+    def _invalidate(self) -> None:
+        '''
+        Drop the memoized structural key of this node and of its ancestors in
+        every tree that holds it.
+        '''
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._key is None:
+                continue
+            node._key = None
+            if node._parent is not None:
+                stack.append(node._parent)
+            if node._owners:
+                stack.extend(node._owners)
+
+    def __repr__(self) -> str:
+        return f'{self}'
+    
+    def __str__(self) -> str:
+        return self._to_str(indent_level=0)
+    
+    def _attr_items(self) -> Iterator:
+        attrs = self._attrs
+        if type(attrs) is tuple:
+            return zip(attrs[::2], attrs[1::2])
+        return attrs.items()
+
+    def _start_tag(self, ids: IdAllocator = None) -> str:
+        classes = f' class="{class_attribute(self._class_names)}"' if self._class_names else ''
+
+        attrs = ''
+        if self._attrs:
+            parts = []
+            for key, value in self._attr_items():
+                # The escaped form of string values is looked up without a call.
+                if value.__class__ is str:
+                    escaped = _ESCAPED_ATTRIBUTES.get(value)
+                    if escaped is None:
+                        escaped = escape_attribute(value)
+                elif value.__class__ is AutoId:
+                    escaped = ids.get(value)
+                else:
+                    escaped = escape_attribute(value)
+                parts.append(f' {key}="{escaped}"')
+            attrs = ''.join(parts)
+
+        return f'<{self._tag}{classes}{attrs}>'
+
+    def _to_str(self, indent_level: int) -> str:
+        return render(self, indent_level=indent_level)
+
+    def render(self, **options) -> str:
+        '''
+        Return the markup. The options are those of pyhtml.renderer.Renderer:
+        cache, minify, parallel and stats.
+        '''
+        return render(self, **options)
+
+    def iter_render(self, chunk_size: int = 4096, **options) -> Iterator[str]:
+        '''
+        Yield the markup in chunks of roughly chunk_size characters. Joining the
+        chunks gives exactly str(self), but only one chunk is held at a time.
+        Children given as a generator are made as they are rendered, so a
+        listing of a million rows never holds more than a chunk of them. Such
+        children are consumed by the first render.
+        '''
+        return iter_render(self, chunk_size=chunk_size, **options)
+
+    async def render_async(self, **options) -> str:
+        '''
+        Await every pending child concurrently, then return the markup. Children can
+        be awaitables or async callables; their results (elements, lists of elements,
+        or for a whole children value a string) replace them in the tree.
+        '''
+        from .aio import render_async
+        return await render_async(self, **options)
+
+    def stream_async(self, chunk_size: int = 4096, **options) -> AsyncIterator[str]:
+        '''
+        Yield the markup in chunks for ASGI responses while pending children are
+        awaited concurrently. Chunks before a pending child are sent without
+        waiting for it.
+        '''
+        from .aio import stream_async
+        return stream_async(self, chunk_size=chunk_size, **options)
+
+    def compile(self, minify: bool = False) -> 'Template':
+        '''
+        Render the tree once and freeze it into a Template. Text children and
+        attribute values set to a Slot become the values passed to the template.
+        '''
+        from .template import compile_template
+        return compile_template(render(self, minify=minify))
+
+def _join_classes(defaults: Tuple[str, ...], extra: List[str]) -> Tuple[str, ...]:
+    '''
+    Return the default class names of a component followed by the extra ones.
+    The defaults are computed once per class, and shared by all of its
+    elements that have no extra class names.
+    '''
+    return defaults + tuple(extra) if extra else defaults
+
+class Title(Base):
+    __slots__ = ()
+
+    def __init__(self, title: str = 'Document') -> None:
+        super().__init__(tag='title', children=title)
+
+class Meta(Base):
+    __slots__ = ()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(tag='meta', **kwargs)
+
+class Link(Base):
+    __slots__ = ()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(tag='link', **kwargs)
+
+class Script(Base):
+    __slots__ = ()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(tag='script', **kwargs)
+
+class Style(Base):
+    __slots__ = ()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(tag='style', **kwargs)
+
+class Head(Base):
+    __slots__ = ()
+
+    def __init__(self, stylesheet: str = None, **kwargs) -> None:
+        '''
+        stylesheet is the href of a stylesheet written by tailwind.build_stylesheet,
+        linked instead of the in-browser Tailwind script.
+        '''
+        if stylesheet is None:
+            tailwind = Script(src='https://unpkg.com/@tailwindcss/browser@4')
+        else:
+            tailwind = Link(rel='stylesheet', href=stylesheet)
+        if theme.href is None:
+            colors = Style(children=theme.stylesheet)
+        else:
+            colors = Link(rel='stylesheet', href=theme.href)
+        base_value = [
+            Meta(charset='UTF-8'),
+            Meta(name='viewport', content="width=device-width, initial-scale=1.0"),
+            Link(rel='stylesheet', href='https://fonts.googleapis.com/css2?family=Material+Symbols+Outlined:opsz,wght,FILL,GRAD@24,400,0,0'),
+            tailwind,
+            colors,
+            Title(title=kwargs.get('title', 'Document'))
+        ]
+        base_value.extend(kwargs.get('children', []))
+        super().__init__(tag='head', children=base_value, **kwargs)
+
+class Body(Base):
+    __slots__ = ()
+    _hoist = True
+    _classes = Styles().w('dvw').h('dvh').flex('col') \
+        .justify('center').items('center').overflow('x-hidden').overflow('y_auto').to_tuple()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(
+            tag='body',
+            style='background-color:var(--color-primary);transition:background-color 0.3s ease,color 0.3s ease;',
+            class_names=_join_classes(self._classes, kwargs.pop('class_names', ())),
+            **kwargs
+        )
+
+class HTML(Base):
+    __slots__ = ()
+    _document = True
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(
+            tag='html',
+            lang='en',
+            children=[
+                Head(title=kwargs.pop('title', 'Document'), stylesheet=kwargs.pop('stylesheet', None)),
+                Body(children=kwargs.pop('children', []))
+            ],
+            **kwargs
+        )
+
+    def stream(self, chunk_size: int = 4096, **options) -> Iterator[str]:
+        '''
+        Stream the document for chunked responses, e.g. Response(html.stream()) in Flask.
+        '''
+        return self.iter_render(chunk_size=chunk_size, **options)
+
+    def render(self, filename: str = None, reload: bool = True, **options) -> str:
+        return render(self, **options)
+
+    def save(self, filename, reload: bool = True, manifest: 'Manifest' = None, **options) -> str:
+        '''
+        Write the document to templates/filename. With a Manifest, the file is
+        written atomically to its directory, and only if its content changed.
+        '''
+        if manifest is not None:
+            if manifest.write(filename, render(self, **options)):
+                return filename
+            return None
+        if reload or not os.path.isfile(os.path.join('templates', filename)):
+            os.makedirs('templates', exist_ok=True)
+            with open(os.path.join('templates', filename), 'w', encoding='utf-8') as file:
+                file.writelines(self.iter_render(**options))
+            return filename
+
+class Text(Base):
+    __slots__ = ()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(tag='p', style='color:var(--color-tertiary);', **kwargs)
+
+class Label(Base):
+    __slots__ = ()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(tag='label', style='color:var(--color-tertiary);', **kwargs)
+
+class Span(Base):
+    __slots__ = ()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(tag='span', style='color:var(--color-tertiary);', **kwargs)
+
+class Row(Base):
+    __slots__ = ()
+    _classes = Styles().flex('row').justify('center').items('center').gap(2).to_tuple()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(
+            tag='div',
+            class_names=_join_classes(self._classes, kwargs.pop('class_names', ())),
+            **kwargs
+        )
+
+class Column(Base):
+    __slots__ = ()
+    _classes = Styles().flex('col').justify('center').items('center').gap(2).to_tuple()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(
+            tag='div',
+            class_names=_join_classes(self._classes, kwargs.pop('class_names', ())),
+            **kwargs
+        )
+
+class Input(Base):
+    __slots__ = ()
+    _classes = Styles().rounded('lg').p('2.5').border('1').to_tuple()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(
+            tag='input', 
+            style='background-color: var(--color-primary);color:var(--color-tertiary);',
+            class_names=_join_classes(self._classes, kwargs.pop('class_names', ())),
+            **kwargs
+        )
+
+class Form(Base):
+    __slots__ = ()
+    _classes = ('flex', 'flex-col', 'justify-center', 'items-center', 'gap-2', 'border', 'rounded-lg', 'p-5')
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(
+            tag='form', 
+            class_names=_join_classes(self._classes, kwargs.pop('class_names', ())),
+            **kwargs
+        )
+
+class Anchor(Base):
+    __slots__ = ()
+    _classes = Styles().underline().cursor('pointer').to_tuple()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(
+            tag='a', 
+            style='color:var(--color-tertiary);',
+            class_names=_join_classes(self._classes, kwargs.pop('class_names', ())),
+            **kwargs
+        )
+
+class A(Anchor):
+    __slots__ = ()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+
+class Button(Base):
+    __slots__ = ()
+    _classes = Styles().flex('row').justify('center').items('center').gap(2) \
+        .rounded('lg').p('2.5').cursor('pointer').hover('opacity-75').to_tuple()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(
+            tag='button', 
+            style='background-color:var(--color-secondary);color:var(--color-tertiary);',
+            class_names=_join_classes(self._classes, kwargs.pop('class_names', ())),
+            **kwargs
+        )
+
+class Icon(Span):
+    __slots__ = ()
+    _classes = ('material-symbols-outlined',)
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(
+            class_names=_join_classes(self._classes, kwargs.pop('class_names', ())),
+            **kwargs
+        )
+
+class Image(Base):
+    __slots__ = ()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+
+class Select(Base):
+    __slots__ = ()
+    _classes = Styles().rounded('lg').p('2.5').border('1').to_tuple()
+
+    def __init__(self, **kwargs) -> None:
+        id = kwargs.pop('id', AutoId('select'))
+        items = kwargs.pop('items', [])
+        # Other iterables than lists, e.g. generators, are read while rendering.
+        if isinstance(items, (list, tuple)):
+            options = [Option(value=item) for item in items]
+        else:
+            options = map(_option, items)
+        super().__init__(
+            id=id,
+            tag='select', 
+            style='background-color:var(--color-primary);color:var(--color-tertiary);',
+            class_names=_join_classes(self._classes, kwargs.pop('class_names', ())),
+            children=options,
+            **kwargs
+        )
+
+def _option(value: str) -> 'Option':
+    return Option(value=value)
+
+class Option(Base):
+    __slots__ = ()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(
+            tag='option',
+            class_names=kwargs.pop('class_names', ()),
+            value=kwargs.get('value', ''),
+            children=kwargs.pop('value', '').replace('_', ' ').capitalize()
+        )
+
+# The scripts can run again when fragments or patches bring new elements: they
+# set up the elements present and add their listener only once.
+register('theme-select', '''
+document.documentElement.className = localStorage.getItem('themeMode') || 'light';
+document.querySelectorAll('[data-theme-select]').forEach(function(select) {
+    select.value = document.documentElement.className;
+});
+if (!window.pyhtmlThemeSelect) {
+    window.pyhtmlThemeSelect = true;
+    document.addEventListener('change', function(event) {
+        if (event.target.matches('[data-theme-select]')) {
+            document.documentElement.className = event.target.value;
+            localStorage.setItem('themeMode', event.target.value);
+        }
+    });
+}
+''')
+
+class SelectTheme(Base):
+    __slots__ = ()
+    _behavior = 'theme-select'
+    _classes = Styles().absolute().bottom('5').left('5').rounded('lg').p('2.5').border('1').to_tuple()
+
+    def __init__(self, **kwargs) -> None:
+        id = kwargs.pop('id', AutoId('theme'))
+        super().__init__(
+            id=id,
+            tag='select', 
+            style='background-color:var(--color-primary);color:var(--color-tertiary);',
+            class_names=_join_classes(self._classes, kwargs.pop('class_names', ())),
+            children=[Option(value=item) for item in theme.keys],
+            **{'data-theme-select': ''},
+            **kwargs
+        )
+
+register('dark-toggle', '''
+(function() {
+    var enabled = localStorage.getItem('darkMode') === 'enabled';
+    if (enabled) {
+        document.documentElement.classList.add('dark');
+    }
+    document.querySelectorAll('[data-dark-toggle]').forEach(function(input) {
+        input.checked = enabled;
+    });
+    if (window.pyhtmlDarkToggle) {
+        return;
+    }
+    window.pyhtmlDarkToggle = true;
+    document.addEventListener('change', function(event) {
+        if (!event.target.matches('[data-dark-toggle]')) {
+            return;
+        }
+        var checked = event.target.checked;
+        document.documentElement.classList.toggle('dark', checked);
+        localStorage.setItem('darkMode', checked ? 'enabled' : 'disabled');
+        document.querySelectorAll('[data-dark-toggle]').forEach(function(input) {
+            input.checked = checked;
+        });
+    });
+})();
+''')
+
+class ToggleButton(Label):
+    __slots__ = ()
+    _behavior = 'dark-toggle'
+    _classes = Styles().inline_flex().items('center').cursor('pointer').to_tuple()
+    _input_classes = Styles().sr_only().peer().to_tuple()
+    _track_classes = Styles().relative().w('11').h('6').bg('gray-200').other('peer-focus:outline-none').other('peer-focus:ring-4').other('peer-focus:ring-blue-300').rounded('full').peer().bg('gray-700').other('peer_checked:bg-blue-600').other('peer-checked:after:translate-x-full rtl:peer-checked:after:-translate-x-full').other("peer-checked:after:border-white after:content-[''] after:absolute after:top-[2px]").other('after:start-[2px] after:bg-white after:border-gray-300 after:border').other('after:rounded-full after:h-5 after:w-5 after:transition-all peer-checked:bg-blue-600').to_tuple()
+    _label_classes = Styles().text('sm').font('medium').other('ms-3').to_tuple()
+
+    def __init__(self, value: str = '', class_names: List[str] = ()):
+        id = AutoId('toggle')
+        super().__init__(
+            class_names=_join_classes(self._classes, class_names),
+            children=[
+                Input(
+                    type='checkbox',
+                    value='',
+                    class_names=self._input_classes,
+                    id=id,
+                    **{'data-dark-toggle': ''},
+                ),
+                Base(
+                    tag='div',
+                    class_names=self._track_classes
+                ),
+                Span(
+                    class_names=self._label_classes,
+                    children=value
+                )
+            ]
+        )
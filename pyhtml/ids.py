@@ -0,0 +1,71 @@
+# pyhtml/ids.py
+
+from typing import Dict, Tuple
+import re
+
+# Written in place of ids by the renderers of parallel chunks, and numbered
+# when the chunks are joined in document order.
+_MARKER = re.compile('\x01([^\x01\x02]*)\x02([0-9]+)\x01')
+
+# Auto ids start with it, so they do not take the ids given to elements by
+# hand, which should not.
+PREFIX = 'pyhtml-'
+
+class AutoId:
+    __slots__ = ('prefix',)
+
+    def __init__(self, prefix: str = 'id') -> None:
+        '''
+        An attribute value replaced by an id when the tree is rendered. Ids are
+        numbered per prefix in document order (pyhtml-select-1, pyhtml-select-2,
+        ...), so the same tree always renders to the same bytes. One AutoId gets
+        the same id wherever it is used in a document, e.g. as id and as the for
+        of a Label. Subtrees holding one are not cached, their ids depend on the
+        document.
+        '''
+        self.prefix = prefix
+
+    def __repr__(self) -> str:
+        return f'AutoId({self.prefix!r})'
+
+class IdAllocator:
+    def __init__(self, deferred: bool = False) -> None:
+        '''
+        Hands out the ids of one document render. With deferred, markers are
+        written instead, and resolve() numbers them in the renderer of the document.
+        '''
+        self._deferred = deferred
+        self._counts: Dict[str, int] = {}
+        self._ids: Dict[int, str] = {}
+
+    def get(self, auto: AutoId) -> str:
+        value = self._ids.get(id(auto))
+        if value is None:
+            count = self._counts.get(auto.prefix, 0) + 1
+            self._counts[auto.prefix] = count
+            if self._deferred:
+                value = f'\x01{auto.prefix}\x02{count}\x01'
+            else:
+                value = f'{PREFIX}{auto.prefix}-{count}'
+            self._ids[id(auto)] = value
+        return value
+
+    def resolve(self, text: str) -> str:
+        '''
+        Replace the markers of a deferred allocator with ids that follow the ones
+        handed out so far.
+        '''
+        if '\x01' not in text:
+            return text
+        local: Dict[Tuple[str, str], str] = {}
+
+        def replace(match: re.Match) -> str:
+            value = local.get(match.groups())
+            if value is None:
+                prefix = match.group(1)
+                count = self._counts.get(prefix, 0) + 1
+                self._counts[prefix] = count
+                value = local[match.groups()] = f'{PREFIX}{prefix}-{count}'
+            return value
+
+        return _MARKER.sub(replace, text)
@@ -0,0 +1,107 @@
+# pyhtml/markup.py
+
+from typing import Any, Dict, Tuple
+
+# Elements whose content is code, written as is.
+RAW_TEXT = frozenset(('script', 'style'))
+
+class Markup(str):
+    __slots__ = ()
+
+    def __new__(cls, text: Any = '') -> 'Markup':
+        '''
+        A string of trusted markup. The renderer escapes text children and
+        attribute values, except Markup and the Code pyhtml generates, which are
+        written as is. Objects with an __html__ method, such as the Markup of
+        markupsafe, are trusted as well.
+        '''
+        if hasattr(text, '__html__'):
+            text = text.__html__()
+        return super().__new__(cls, text)
+
+    def __html__(self) -> 'Markup':
+        return self
+
+    def __add__(self, other: Any) -> 'Markup':
+        if isinstance(other, str):
+            return Markup(str.__add__(self, escape(other)))
+        return NotImplemented
+
+    def __radd__(self, other: Any) -> 'Markup':
+        if isinstance(other, str):
+            return Markup(str.__add__(escape(other), self))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'Markup({str.__repr__(self)})'
+
+def escape(value: Any) -> str:
+    '''
+    Return value as text safe inside an element or a double-quoted attribute:
+    & < > and " are replaced by their character references. Markup, Code and
+    objects with __html__ are returned unchanged.
+    '''
+    if value.__class__ is not str:
+        if hasattr(value, '__html__'):
+            return value.__html__()
+        value = str(value)
+    # Chained replace is faster than str.translate or a regular expression in
+    # CPython, and costs a scan per character when there is nothing to replace.
+    if '&' in value:
+        value = value.replace('&', '&amp;')
+    if '<' in value:
+        value = value.replace('<', '&lt;')
+    if '>' in value:
+        value = value.replace('>', '&gt;')
+    if '"' in value:
+        value = value.replace('"', '&quot;')
+    return value
+
+def escape_text(value: str) -> str:
+    '''
+    Like escape, for the text of an element, where " needs no escaping.
+    '''
+    if value.__class__ is not str:
+        return escape(value)
+    if '&' in value:
+        value = value.replace('&', '&amp;')
+    if '<' in value:
+        value = value.replace('<', '&lt;')
+    if '>' in value:
+        value = value.replace('>', '&gt;')
+    return value
+
+# Attribute values are mostly the same few strings (the style of a component,
+# its class names), so their escaped form is kept.
+_ATTRIBUTES: Dict[str, str] = {}
+_CLASSES: Dict[Tuple[str, ...], str] = {}
+_CACHE_SIZE = 4096
+
+def escape_attribute(value: Any) -> str:
+    '''
+    escape, with the escaped form of repeated string values cached.
+    '''
+    if value.__class__ is not str:
+        return escape(value)
+    escaped = _ATTRIBUTES.get(value)
+    if escaped is None:
+        escaped = escape(value)
+        if len(_ATTRIBUTES) >= _CACHE_SIZE:
+            _ATTRIBUTES.clear()
+        _ATTRIBUTES[value] = escaped
+    return escaped
+
+def class_attribute(class_names: Any) -> str:
+    '''
+    Return the escaped value of the class attribute. The tuples of class names
+    of components are shared by their elements, so they are cached.
+    '''
+    if type(class_names) is not tuple:
+        return escape(' '.join(class_names))
+    escaped = _CLASSES.get(class_names)
+    if escaped is None:
+        escaped = escape(' '.join(class_names))
+        if len(_CLASSES) >= _CACHE_SIZE:
+            _CLASSES.clear()
+        _CLASSES[class_names] = escaped
+    return escaped
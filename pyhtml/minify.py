@@ -0,0 +1,53 @@
+# pyhtml/minify.py
+
+from typing import Literal
+import re
+
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON = re.compile(r':\s+')
+
+def condense_css(text: str) -> str:
+    '''
+    Remove indentation, blank lines and the spaces around CSS punctuation.
+    Only meant for the stylesheets pyhtml generates itself.
+    '''
+    text = ''.join(line.strip() for line in text.splitlines())
+    text = _CSS_PUNCTUATION.sub(r'\1', text)
+    return _CSS_COLON.sub(':', text).replace(';}', '}')
+
+def condense_js(text: str) -> str:
+    '''
+    Remove indentation and blank lines. Lines are joined directly after a ; { } or ,
+    and keep their line break otherwise, so automatic semicolon insertion still
+    applies. Only meant for the scripts pyhtml generates itself.
+    '''
+    condensed = ''
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if condensed and condensed[-1] not in ';{},':
+            condensed += '\n'
+        condensed += line
+    return condensed
+
+class Code(str):
+    def __new__(cls, text: str, language: Literal['css', 'js'] = 'js') -> 'Code':
+        '''
+        The content of a <style> or <script> element generated by pyhtml. It renders
+        as is, and as its condensed form when the tree is rendered with minify=True.
+        '''
+        code = super().__new__(cls, text)
+        code.language = language
+        code._minified = None
+        return code
+
+    def __html__(self) -> 'Code':
+        # Generated by pyhtml, so it is written without escaping.
+        return self
+
+    @property
+    def minified(self) -> str:
+        if self._minified is None:
+            self._minified = condense_css(self) if self.language == 'css' else condense_js(self)
+        return self._minified
@@ -0,0 +1,164 @@
+# pyhtml/parallel.py
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import os
+import sys
+import threading
+
+# The roots of the renders that forked a pool. Its workers read the children of
+# wide elements from their copy of this process's memory, so only the position
+# of the children goes through the pool instead of pickled elements.
+_SHARED: Dict[int, Tuple[Any, ...]] = {}
+
+def _gil_enabled() -> bool:
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is None or is_gil_enabled()
+
+def _render_chunk(nodes: List[Any], indent_level: int, minify: bool) -> Tuple[str, Tuple[str, ...]]:
+    from .renderer import Renderer
+    renderer = Renderer(minify=minify)
+    # Ids are numbered by the renderer of the document when the chunks are joined.
+    renderer._deferred_ids = True
+    renderer._partial = True
+    text = renderer.render_nodes(nodes, indent_level)
+    return text, tuple(renderer.behaviors)
+
+def _render_shared(key: int, path: Tuple[int, ...], start: int, stop: int, indent_level: int, minify: bool) -> Tuple[str, Tuple[str, ...]]:
+    node = _SHARED[key][path[0]]
+    for index in path[1:]:
+        node = node._children[index]
+    return _render_chunk(node._children[start:stop], indent_level, minify)
+
+def _path(roots: Tuple[Any, ...], node: Any) -> Optional[Tuple[int, ...]]:
+    '''
+    Return the indices of node and its ancestors among their siblings, from one
+    of roots down, or None when node is not in the tree of roots.
+    '''
+    positions = {id(root): index for index, root in enumerate(roots)}
+    path = []
+    while id(node) not in positions:
+        parent = node._parent
+        if parent is None or not isinstance(parent._children, list):
+            return None
+        index = next((index for index, sibling in enumerate(parent._children) if sibling is node), None)
+        if index is None:
+            return None
+        path.append(index)
+        node = parent
+    path.append(positions[id(node)])
+    return tuple(reversed(path))
+
+class _Session:
+    def __init__(self, parallel: 'Parallel', roots: Tuple[Any, ...]) -> None:
+        '''
+        The pool of one render. It is forked when the first wide element is met
+        and used for the others, then shut down by close().
+        '''
+        self._parallel = parallel
+        self._roots = roots
+        self._executor = None
+
+    def map(self, node: Any, indent_level: int, minify: bool = False) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        '''
+        Yield the markup of the children of node chunk by chunk, as Parallel.map.
+        '''
+        parallel = self._parallel
+        children = node._children
+        # Forking a process that runs other threads can deadlock, so those get
+        # the pool of Parallel, which is not forked.
+        if self._executor is None and (not parallel._fork or threading.active_count() > 1):
+            yield from parallel.map(children, indent_level, minify)
+            return
+        path = _path(self._roots, node)
+        if path is None:
+            yield from parallel.map(children, indent_level, minify)
+            return
+
+        size = parallel._chunk_size
+        ranges = [(start, start + size) for start in range(0, len(children), size)]
+        if self._executor is None:
+            _SHARED[id(self)] = self._roots
+            workers = min(parallel._workers or os.cpu_count() or 1, len(ranges))
+            self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'))
+        futures = [
+            self._executor.submit(_render_shared, id(self), path, start, stop, indent_level, minify)
+            for start, stop in ranges
+        ]
+        for (start, stop), future in zip(ranges, futures):
+            try:
+                yield future.result()
+            except Exception:
+                yield _render_chunk(children[start:stop], indent_level, minify)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            del _SHARED[id(self)]
+
+class Parallel:
+    def __init__(self, workers: int = None, threshold: int = 2000, chunk_size: int = 1000) -> None:
+        '''
+        Render the children of wide elements in a pool of workers. Elements with at
+        least threshold children have them split into chunks of chunk_size, which
+        are rendered concurrently and joined in order.
+
+        On free-threaded builds of Python a thread pool is used. Elsewhere, where
+        processes can be forked and no other thread runs, a process pool is
+        forked once per render and reads the children from the memory it shares
+        with this process. Otherwise the chunks are pickled to a process pool,
+        started by a fork server where there is one, that is kept until close().
+        '''
+        self._workers = workers
+        self._threshold = threshold
+        self._chunk_size = chunk_size
+        self._executor = None
+        self._fork = _gil_enabled() and 'fork' in multiprocessing.get_all_start_methods()
+
+    @property
+    def threshold(self) -> int:
+        return self._threshold
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if _gil_enabled():
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else None
+                self._executor = ProcessPoolExecutor(max_workers=self._workers, mp_context=multiprocessing.get_context(method))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers)
+        return self._executor
+
+    def session(self, roots: Tuple[Any, ...]) -> _Session:
+        '''
+        Return the pool of a render of roots, see _Session.
+        '''
+        return _Session(self, tuple(roots))
+
+    def map(self, children: List[Any], indent_level: int, minify: bool = False) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        '''
+        Yield the markup of children chunk by chunk, in order, with the behaviors
+        used in each chunk.
+        '''
+        size = self._chunk_size
+        chunks = [children[start:start + size] for start in range(0, len(children), size)]
+        futures = [self.executor.submit(_render_chunk, chunk, indent_level, minify) for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            try:
+                yield future.result()
+            except Exception:
+                # e.g. a chunk holding a lambda cannot be pickled; render it here.
+                yield _render_chunk(chunk, indent_level, minify)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'Parallel':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
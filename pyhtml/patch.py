@@ -0,0 +1,245 @@
+# pyhtml/patch.py
+
+from typing import Any, Dict, List, Optional, Tuple
+import json
+from html import unescape
+from .ids import AutoId, IdAllocator
+from .markup import RAW_TEXT, escape_text
+from .minify import Code
+from .behaviors import scripts
+from .renderer import Renderer
+
+# Applies the patches of diff() in the browser: pyhtmlPatch(element, patches)
+# where element is the root of the rendered tree, e.g. document.documentElement.
+CLIENT = Code('''
+function pyhtmlPatch(root, patches) {
+    function fragment(html) {
+        var template = document.createElement('template');
+        template.innerHTML = html;
+        return template.content;
+    }
+    patches.forEach(function(patch) {
+        var op = patch[0], value = patch[2], node = root;
+        patch[1].forEach(function(index) {
+            node = node.children[index];
+        });
+        if (op === 'replace') {
+            node.replaceWith(fragment(value));
+        } else if (op === 'content') {
+            node.innerHTML = value;
+        } else if (op === 'attrs') {
+            Object.keys(value[0]).forEach(function(name) {
+                node.setAttribute(name, value[0][name]);
+            });
+            value[1].forEach(function(name) {
+                node.removeAttribute(name);
+            });
+        } else if (op === 'insert') {
+            node.insertBefore(fragment(value[1]), node.children[value[0]] || null);
+        } else if (op === 'script') {
+            var script = document.createElement('script');
+            script.textContent = value;
+            document.head.appendChild(script);
+            script.remove();
+        } else if (op === 'remove') {
+            node.remove();
+        } else if (op === 'move') {
+            var child = node.children[value[0]];
+            node.removeChild(child);
+            node.insertBefore(child, node.children[value[1]] || null);
+        }
+    });
+}
+''')
+
+class Patch:
+    __slots__ = ('op', 'path', 'value')
+
+    def __init__(self, op: str, path: Tuple[int, ...], value: Any = None) -> None:
+        '''
+        One change to a rendered tree. path holds the indexes of the elements
+        from the root down to the element changed, or for insert and move to
+        the parent of the children moved. value depends on op:
+
+            replace  the markup of the new element
+            content  the new content of the element, as markup
+            attrs    [{name: value} to set, [names] to remove]
+            insert   [index, markup of the new child]
+            remove   None, the element at path is removed
+            move     [index before, index after] of a child of the element
+            script   the scripts of the behaviors new elements bring, path is ()
+        '''
+        self.op = op
+        self.path = path
+        self.value = value
+
+    def as_list(self) -> List[Any]:
+        return [self.op, list(self.path), self.value]
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Patch) and self.as_list() == other.as_list()
+
+    def __repr__(self) -> str:
+        return f'Patch({self.op!r}, {self.path!r}, {self.value!r})'
+
+def to_json(patches: List[Patch]) -> str:
+    '''
+    Serialize patches compactly, as the list of lists pyhtmlPatch expects.
+    '''
+    return json.dumps([patch.as_list() for patch in patches], separators=(',', ':'))
+
+def _key(node: Any) -> Optional[str]:
+    for name, value in node._attr_items():
+        if name == 'key':
+            return str(value)
+    return None
+
+def _attributes(node: Any, ids: IdAllocator) -> Dict[str, Any]:
+    attributes = {}
+    if node._class_names:
+        attributes['class'] = ' '.join(node._class_names)
+    for name, value in node._attr_items():
+        attributes[name] = ids.get(value) if value.__class__ is AutoId else value
+    return attributes
+
+def _number(root: Any) -> IdAllocator:
+    '''
+    Return an allocator holding the ids the auto ids of root get when root is
+    rendered, handed out in the order the renderer meets them.
+    '''
+    ids = IdAllocator()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for _, value in node._attr_items():
+            if value.__class__ is AutoId:
+                ids.get(value)
+        content = node._children
+        if isinstance(content, list):
+            stack.extend(child for child in reversed(content) if hasattr(child, '_tag'))
+    return ids
+
+def _behaviors(root: Any) -> Dict[str, None]:
+    '''
+    Return the names of the behaviors used in the tree of root, in document order.
+    '''
+    behaviors = {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node._behavior is not None:
+            behaviors[node._behavior] = None
+        content = node._children
+        if isinstance(content, list):
+            stack.extend(child for child in reversed(content) if hasattr(child, '_tag'))
+    return behaviors
+
+def diff(old: Any, new: Any, **options) -> List[Patch]:
+    '''
+    Compare two trees and return the patches that turn the markup of old into
+    the markup of new. Elements are matched by position, or by their key
+    attribute when every child of both lists has one, so reordered children
+    are moved rather than rendered again. The markup of new elements is
+    rendered with the options of Renderer, minified unless minify=False.
+    Auto ids are compared and rendered as numbered in each whole document, so
+    elements that shift get their new ids and new elements do not reuse one.
+    The scripts of behaviors that new elements use and old did not come last,
+    in a script patch, as the markup inserted holds none.
+    '''
+    options.setdefault('minify', True)
+    old_ids, new_ids = _number(old), _number(new)
+    renderer = Renderer(**options)
+    renderer._ids = new_ids
+    renderer._partial = True
+    minify = options['minify']
+    patches: List[Patch] = []
+    stack = [(old, new, ())]
+    while stack:
+        before, after, path = stack.pop()
+        if type(before) is not type(after) or before._tag != after._tag:
+            patches.append(Patch('replace', path, renderer.render(after)))
+            continue
+
+        old_attributes, new_attributes = _attributes(before, old_ids), _attributes(after, new_ids)
+        # setAttribute takes the value itself, so Markup is turned back into text.
+        changed = {
+            name: unescape(value) if hasattr(value, '__html__') else str(value)
+            for name, value in new_attributes.items()
+            if name not in old_attributes or old_attributes[name] != value
+        }
+        removed = [name for name in old_attributes if name not in new_attributes]
+        if changed or removed:
+            patches.append(Patch('attrs', path, [changed, removed]))
+
+        old_content, new_content = before._children, after._children
+        old_list = isinstance(old_content, (list, tuple))
+        new_list = isinstance(new_content, (list, tuple))
+        if not old_list or not new_list:
+            if old_content != new_content or type(old_content) is not type(new_content):
+                if isinstance(new_content, str):
+                    if minify and isinstance(new_content, Code):
+                        text = new_content.minified
+                    elif after._tag in RAW_TEXT:
+                        text = new_content
+                    else:
+                        text = escape_text(new_content)
+                    patches.append(Patch('content', path, str(text)))
+                else:
+                    patches.append(Patch('replace', path, renderer.render(after)))
+            continue
+
+        pairs = _diff_children(list(old_content), list(new_content), path, renderer, patches)
+        # Pushed in reverse so the patches of the children come in document order.
+        stack.extend((before_child, after_child, path + (index,)) for index, before_child, after_child in reversed(pairs))
+
+    old_behaviors = _behaviors(old)
+    added = [name for name in _behaviors(new) if name not in old_behaviors]
+    if added:
+        code = scripts(added)
+        patches.append(Patch('script', (), str(code.minified if minify else code)))
+    return patches
+
+def _diff_children(
+    old: List[Any],
+    new: List[Any],
+    path: Tuple[int, ...],
+    renderer: Renderer,
+    patches: List[Patch],
+) -> List[Tuple[int, Any, Any]]:
+    '''
+    Append the patches that insert, remove and move children, and return the
+    (index, old child, new child) pairs left to compare.
+    '''
+    old_keys = [_key(child) for child in old]
+    new_keys = [_key(child) for child in new]
+    keyed = (
+        None not in old_keys and None not in new_keys
+        and len(set(old_keys)) == len(old_keys) and len(set(new_keys)) == len(new_keys)
+    )
+    if not keyed:
+        common = min(len(old), len(new))
+        for index in range(len(old) - 1, common - 1, -1):
+            patches.append(Patch('remove', path + (index,)))
+        for index in range(common, len(new)):
+            patches.append(Patch('insert', path, [index, renderer.render(new[index])]))
+        return [(index, old[index], new[index]) for index in range(common)]
+
+    by_key = dict(zip(old_keys, old))
+    wanted = set(new_keys)
+    for index in range(len(old) - 1, -1, -1):
+        if old_keys[index] not in wanted:
+            patches.append(Patch('remove', path + (index,)))
+    current = [key for key in old_keys if key in wanted]
+
+    pairs = []
+    for index, (key, child) in enumerate(zip(new_keys, new)):
+        if key in by_key:
+            position = current.index(key, index)
+            if position != index:
+                patches.append(Patch('move', path, [position, index]))
+                current.insert(index, current.pop(position))
+            pairs.append((index, by_key[key], child))
+        else:
+            patches.append(Patch('insert', path, [index, renderer.render(child)]))
+            current.insert(index, key)
+    return pairs
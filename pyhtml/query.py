@@ -0,0 +1,257 @@
+# pyhtml/query.py
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from functools import lru_cache
+import re
+
+# (tag, id, class names, attributes as (name, operator, value)) of one compound
+# selector such as input.rounded-lg[type=text]
+Compound = Tuple[Optional[str], Optional[str], Tuple[str, ...], Tuple[Tuple[str, str, str], ...]]
+
+_TOKEN = re.compile(r'''
+    \s*(?P<combinator>>)\s*
+  | (?P<space>\s+)
+  | (?P<tag>\*|[a-zA-Z][\w-]*)
+  | \#(?P<id>[\w-]+)
+  | \.(?P<class>(?:\\.|[\w-])+)
+  | \[\s*(?P<name>[\w:-]+)\s*(?:(?P<operator>[~^$*]?=)\s*(?:"(?P<double>[^"]*)"|'(?P<single>[^']*)'|(?P<bare>[^\s\]]+))\s*)?\]
+''', re.VERBOSE)
+
+class TreeIndex:
+    __slots__ = ('ids', 'tags', 'classes', 'ordered')
+
+    def __init__(self, root: Any) -> None:
+        '''
+        The elements of a tree by id, by tag and by class name, each list in
+        document order. Kept on the root of the tree, see Base.get_by_id. Ids
+        are kept up to date wherever elements are added, since they do not
+        depend on the order. Elements added anywhere but at the end of the
+        document clear ordered, and the lists by tag and class are then built
+        again, by order(), before they are next used.
+        '''
+        self.ids: Dict[str, Any] = {}
+        self.tags: Dict[str, List[Any]] = {}
+        self.classes: Dict[str, List[Any]] = {}
+        self.ordered = True
+        self._add(root, True, True)
+
+    def add(self, root: Any, at_end: bool = True) -> None:
+        '''
+        Add the elements of the subtree of root, which is at the end of the
+        document if at_end. When an id is used twice, the element indexed first
+        keeps it.
+        '''
+        if not at_end:
+            self.ordered = False
+        self._add(root, True, self.ordered)
+
+    def order(self, root: Any) -> None:
+        '''
+        Build the lists by tag and class of the tree of root again.
+        '''
+        self.tags = {}
+        self.classes = {}
+        self._add(root, False, True)
+        self.ordered = True
+
+    def _add(self, root: Any, with_ids: bool, with_lists: bool) -> None:
+        ids, tags, classes = self.ids, self.tags, self.classes
+        # Components share their tuple of class names, so it is split once.
+        split: Dict[Tuple[str, ...], List[str]] = {}
+        for node in iter_elements(root):
+            if with_lists:
+                nodes = tags.get(node._tag)
+                if nodes is None:
+                    tags[node._tag] = [node]
+                else:
+                    nodes.append(node)
+                class_names = node._class_names
+                if class_names:
+                    if type(class_names) is tuple:
+                        names = split.get(class_names)
+                        if names is None:
+                            names = split[class_names] = class_list(class_names)
+                    else:
+                        names = class_list(class_names)
+                    for name in names:
+                        nodes = classes.get(name)
+                        if nodes is None:
+                            classes[name] = [node]
+                        else:
+                            nodes.append(node)
+            if with_ids:
+                for key, value in node._attr_items():
+                    if key == 'id':
+                        if isinstance(value, str):
+                            ids.setdefault(value, node)
+                        break
+
+def class_list(class_names: List[str]) -> List[str]:
+    '''
+    Return the classes of class_names once each. Class names made by Styles can
+    hold several classes, e.g. 'flex flex-row'.
+    '''
+    return list(dict.fromkeys(' '.join(class_names).split()))
+
+def iter_elements(root: Any) -> Iterator[Any]:
+    '''
+    Yield root and the elements below it in document order.
+    '''
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        content = node._children
+        if isinstance(content, list):
+            stack.extend(child for child in reversed(content) if hasattr(child, '_tag'))
+
+@lru_cache(maxsize=256)
+def parse_selector(selector: str) -> Tuple[Tuple[Optional[str], Compound], ...]:
+    '''
+    Parse a selector into its compound selectors, each with the combinator
+    before it: ' ' for a descendant, '>' for a child, None for the first.
+    Supported are tags, *, .class, #id, [name], [name=value] (also ~=, ^=, $=
+    and *=) and the descendant and child combinators.
+    '''
+    steps = []
+    combinator = None
+    tag, element_id, classes, attributes = None, None, [], []
+    started = False
+    position = 0
+    selector = selector.strip()
+    while position < len(selector):
+        match = _TOKEN.match(selector, position)
+        if match is None:
+            raise ValueError(f'Invalid selector {selector!r} at position {position}')
+        position = match.end()
+        kind = match.lastgroup if match.lastgroup in ('combinator', 'space', 'tag', 'id', 'class') else 'attribute'
+        if kind in ('combinator', 'space'):
+            if not started:
+                raise ValueError(f'Invalid selector {selector!r}: combinator without a selector before it')
+            steps.append((combinator, (tag, element_id, tuple(classes), tuple(attributes))))
+            combinator = '>' if kind == 'combinator' else ' '
+            tag, element_id, classes, attributes = None, None, [], []
+            started = False
+            continue
+        if kind == 'tag':
+            if started:
+                raise ValueError(f'Invalid selector {selector!r}: the tag must come first')
+            tag = None if match.group('tag') == '*' else match.group('tag').lower()
+        elif kind == 'id':
+            element_id = match.group('id')
+        elif kind == 'class':
+            classes.append(re.sub(r'\\(.)', r'\1', match.group('class')))
+        else:
+            value = next((group for group in match.group('double', 'single', 'bare') if group is not None), None)
+            attributes.append((match.group('name'), match.group('operator'), value))
+        started = True
+    if not started:
+        raise ValueError(f'Invalid selector {selector!r}')
+    steps.append((combinator, (tag, element_id, tuple(classes), tuple(attributes))))
+    return tuple(steps)
+
+def _attribute_matches(value: Any, operator: Optional[str], expected: str) -> bool:
+    if operator is None:
+        return True
+    if not isinstance(value, str):
+        # Auto ids are numbered at render time, so only [id] matches them.
+        if value.__class__.__name__ == 'AutoId':
+            return False
+        value = str(value)
+    if operator == '=':
+        return value == expected
+    if operator == '~=':
+        return expected in value.split()
+    if operator == '^=':
+        return value.startswith(expected)
+    if operator == '$=':
+        return value.endswith(expected)
+    return expected in value
+
+def matches(node: Any, compound: Compound) -> bool:
+    tag, element_id, classes, attributes = compound
+    if tag is not None and node._tag != tag:
+        return False
+    if classes:
+        names = class_list(node._class_names)
+        for name in classes:
+            if name not in names:
+                return False
+    if element_id is not None or attributes:
+        values = dict(node._attr_items())
+        if element_id is not None and values.get('id') != element_id:
+            return False
+        for name, operator, expected in attributes:
+            if name == 'class':
+                value = ' '.join(node._class_names) if node._class_names else None
+            else:
+                value = values.get(name)
+            if value is None or not _attribute_matches(value, operator, expected):
+                return False
+    return True
+
+def _matches_before(node: Any, steps: Tuple[Tuple[Optional[str], Compound], ...], index: int) -> bool:
+    '''
+    Whether the ancestors of node match the compounds before steps[index],
+    which node itself matches.
+    '''
+    if index == 0:
+        return True
+    combinator = steps[index][0]
+    compound = steps[index - 1][1]
+    parent = node._parent
+    if combinator == '>':
+        return parent is not None and matches(parent, compound) and _matches_before(parent, steps, index - 1)
+    while parent is not None:
+        if matches(parent, compound) and _matches_before(parent, steps, index - 1):
+            return True
+        parent = parent._parent
+    return False
+
+def uses_lists(selector: str) -> bool:
+    '''
+    Whether the candidates of selector come from the lists by tag or class of
+    the index, which must then be in document order.
+    '''
+    tag, element_id, classes, _ = parse_selector(selector)[-1][1]
+    return element_id is None and (tag is not None or bool(classes))
+
+def _candidates(scope: Any, compound: Compound, index: TreeIndex) -> List[Any]:
+    '''
+    The fewest indexed elements that can match compound, in document order.
+    '''
+    tag, element_id, classes, _ = compound
+    if element_id is not None:
+        node = index.ids.get(element_id)
+        return [] if node is None else [node]
+    if classes:
+        return min((index.classes.get(name, ()) for name in classes), key=len)
+    if tag is not None:
+        return index.tags.get(tag, ())
+    return iter_elements(scope)
+
+def _inside(node: Any, scope: Any) -> bool:
+    node = node._parent
+    while node is not None:
+        if node is scope:
+            return True
+        node = node._parent
+    return False
+
+def select(scope: Any, selector: str, index: TreeIndex, root: Any, limit: int = None) -> List[Any]:
+    '''
+    Return the elements below scope that match selector, in document order, at
+    most limit of them. index is the index of the tree whose root is root.
+    '''
+    steps = parse_selector(selector)
+    last = len(steps) - 1
+    compound = steps[last][1]
+    found = []
+    for node in _candidates(scope, compound, index):
+        if node is scope or (scope is not root and not _inside(node, scope)):
+            continue
+        if matches(node, compound) and _matches_before(node, steps, last):
+            found.append(node)
+            if limit is not None and len(found) == limit:
+                break
+    return found
@@ -0,0 +1,380 @@
+# pyhtml/renderer.py
+
+from typing import Any, Dict, Iterator, List, TYPE_CHECKING
+from collections.abc import Awaitable
+from time import perf_counter
+from itertools import chain
+from .behaviors import scripts
+from .cache import RenderCache, structural_key
+from .ids import IdAllocator
+from .markup import RAW_TEXT, Markup, escape_text
+from .minify import Code
+from .stats import RenderStats
+
+if TYPE_CHECKING:
+    # The process pool machinery is only imported by those who use it.
+    from .parallel import Parallel
+
+DOCTYPE = '<!DOCTYPE html>'
+
+_SEPARATOR = object()
+
+# Returned by next() on lazy children that turn out to be empty.
+_EMPTY = object()
+
+_CO_COROUTINE = 0x80
+
+# Marks the end of the children of an element that hoists the scripts of the
+# behaviors used in the document, i.e. Body.
+_HOISTED = object()
+
+_INDENTS = {'  ': [''], '': ['']}
+
+def _indents(depth: int, unit: str = '  ') -> List[str]:
+    '''
+    Return the shared list of indent prefixes, grown to hold at least depth + 1 levels.
+    '''
+    indents = _INDENTS[unit]
+    if len(indents) <= depth:
+        # A longer list replaces the shared one instead of growing it, so
+        # threads rendering at the same time never see a list being changed.
+        indents = [unit * level for level in range(max(depth + 1, 2 * len(indents)))]
+        _INDENTS[unit] = indents
+    return indents
+
+def _separated(children: List[Any]) -> Iterator[Any]:
+    '''
+    Iterate over the children of a document, with a separator between each of them.
+    '''
+    for index, child in enumerate(children):
+        if index:
+            yield _SEPARATOR
+        yield child
+
+def is_pending(value: Any) -> bool:
+    '''
+    Whether value is a child that still has to be awaited: an awaitable or an async callable.
+    '''
+    if isinstance(value, Awaitable):
+        return True
+    # inspect.iscoroutinefunction without importing inspect.
+    code = getattr(getattr(value, '__func__', value), '__code__', None)
+    return code is not None and bool(code.co_flags & _CO_COROUTINE)
+
+def is_lazy(value: Any) -> bool:
+    '''
+    Whether value is lazy children: an iterable other than a list, a tuple or a
+    string, such as a generator, consumed when the element is rendered.
+    Futures and tasks are iterable too, but they are pending children.
+    '''
+    return (
+        value is not None and hasattr(value, '__iter__')
+        and not isinstance(value, (str, list, tuple, Awaitable))
+    )
+
+def as_children(value: Any) -> List[Any]:
+    '''
+    Turn the result of a pending child into the list of children it stands for.
+    '''
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+def as_content(value: Any) -> Any:
+    '''
+    Turn the result of pending children into a value for Base.children.
+    '''
+    if value is None or isinstance(value, str):
+        return value
+    return as_children(value)
+
+class Pending:
+    def __init__(self, value: Any) -> None:
+        '''
+        Yielded by the render engine when it reaches a pending child. The async
+        driver awaits the value and sends the result back into the engine.
+        '''
+        self.value = value
+
+class Renderer:
+    def __init__(
+        self,
+        chunk_size: int = 0,
+        cache: RenderCache = None,
+        minify: bool = False,
+        parallel: 'Parallel' = None,
+        stats: RenderStats = None,
+    ) -> None:
+        '''
+        This class turns a tree of elements into markup without recursion.
+        Every piece of markup is appended to one shared buffer, so the cost is
+        linear in the number of nodes and the depth of the tree is not limited
+        by the interpreter's recursion limit. With a cache, large subtrees that
+        were rendered before are copied from it instead of being walked again.
+        With minify, no indentation or line breaks are written around elements;
+        text is kept as is, except for the Code that pyhtml generates. Text and
+        attribute values are escaped, except Markup, Code and the content of
+        script and style elements. Content with a render_blocks method, like
+        that of Table, writes its own markup in blocks. With
+        parallel, the children of very wide elements are rendered in a pool.
+        The behaviors of the elements met are collected in behaviors, and their
+        scripts are written once, at the end of Body, or at the end of the
+        render for those of elements outside a Body. With stats, the time and
+        markup of every element are recorded per component class; without it,
+        the only cost is a check per element.
+        '''
+        self._chunk_size = chunk_size
+        self._cache = cache
+        self._minify = minify
+        self._parallel = parallel
+        self._stats = stats
+        self._resolving = False
+        self._deferred_ids = False
+        # Set for renders of parts of a tree, e.g. parallel chunks or fragments,
+        # whose caller ships the scripts of the behaviors instead.
+        self._partial = False
+        # The ids of a whole document, given to renders of parts of it by diff().
+        self._ids: IdAllocator = None
+        self.behaviors: Dict[str, None] = {}
+
+    def render(self, node: Any, indent_level: int = 0) -> str:
+        '''
+        Return the markup of node as a single string.
+        '''
+        return self.render_nodes((node,), indent_level)
+
+    def render_nodes(self, nodes: List[Any], indent_level: int = 0) -> str:
+        '''
+        Return the markup of a sequence of sibling nodes as a single string.
+        '''
+        buffer = []
+        for _ in self._walk(nodes, indent_level, buffer):
+            pass
+        return ''.join(buffer)
+
+    def scripts(self, names: List[str], indent_level: int = 0) -> str:
+        '''
+        Return the script element holding the scripts of the given behaviors.
+        '''
+        if not names:
+            return ''
+        code = scripts(names)
+        if self._minify:
+            return f'<script>{code.minified}</script>'
+        indents = _indents(indent_level + 1)
+        return f'{indents[indent_level]}<script>\n{indents[indent_level + 1]}{code}\n{indents[indent_level]}</script>\n'
+
+    def iter_render(self, node: Any, indent_level: int = 0) -> Iterator[str]:
+        '''
+        Yield the markup of node in chunks of roughly chunk_size characters.
+        '''
+        buffer = []
+        yield from self._walk((node,), indent_level, buffer)
+        if buffer:
+            yield ''.join(buffer)
+
+    def _walk(self, roots: List[Any], indent_level: int, buffer: List[str]) -> Iterator[str]:
+        '''
+        Append the markup of roots to buffer. When chunk_size is set, the buffer is
+        emptied into a yielded chunk each time it grows past chunk_size characters.
+        '''
+        chunk_size = self._chunk_size
+        cache = self._cache
+        min_nodes = cache.min_nodes if cache is not None else 0
+        minify = self._minify
+        resolving = self._resolving
+        parallel = self._parallel if not resolving else None
+        threshold = parallel.threshold if parallel is not None else 0
+        # A render that is not finished leaves its pool to be shut down when
+        # it is garbage collected.
+        session = parallel.session(roots) if parallel is not None else None
+        unit, newline = ('', '') if minify else ('  ', '\n')
+        append = buffer.append
+        stats = self._stats
+        if stats is not None:
+            recording = stats._recording()
+            events = recording.events
+            size = 0
+
+            def append(text: str) -> None:
+                nonlocal size
+                size += len(text)
+                buffer.append(text)
+        indents = _indents(indent_level + 1, unit)
+        behaviors = self.behaviors = {}
+        # How many of the behaviors were written at the end of a Body.
+        hoisted = 0
+        ids = self._ids if self._ids is not None else IdAllocator(self._deferred_ids)
+        stack = [(iter(roots), indent_level, None, None)]
+        next_check = 64
+        flushes = 0
+
+        while stack:
+            children, level, end_tag, captured = stack[-1]
+            indent = indents[level]
+            for node in children:
+                if chunk_size and len(buffer) >= next_check:
+                    if sum(map(len, buffer)) >= chunk_size:
+                        yield ''.join(buffer)
+                        buffer.clear()
+                        flushes += 1
+                        next_check = 64
+                    else:
+                        next_check = len(buffer) + 64
+
+                if node is _SEPARATOR:
+                    append(newline)
+                    continue
+                if node is _HOISTED:
+                    if stats is not None:
+                        events.append((None, level, perf_counter(), size))
+                    append(self.scripts(list(behaviors), level))
+                    hoisted = len(behaviors)
+                    continue
+
+                try:
+                    tag = node._tag
+                except AttributeError:
+                    # Blocks of markup written by an element's render_blocks.
+                    # They are long, so the size of the buffer is checked next.
+                    if node.__class__ is Markup:
+                        append(node)
+                        next_check = 0
+                        continue
+                    self._check_pending(node)
+                    if buffer:
+                        yield ''.join(buffer)
+                        buffer.clear()
+                        flushes += 1
+                    resolved = yield Pending(node)
+                    stack.append((iter(as_children(resolved)), level, None, None))
+                    break
+
+                if stats is not None:
+                    events.append((type(node).__name__, level, perf_counter(), size))
+                    if len(events) >= recording.BATCH:
+                        recording.fold()
+                content = node._children
+                if cache is not None and isinstance(content, list) and content and not node._hoist:
+                    structure = structural_key(node)
+                    if structure is not None and structure[1] >= min_nodes:
+                        key = (structure[0], 0 if minify else level, minify)
+                        text = cache.get(key)
+                        if text is not None:
+                            append(text)
+                            if structure[2]:
+                                behaviors.update(dict.fromkeys(structure[2]))
+                            continue
+                        capture = (key, len(buffer), flushes)
+                    else:
+                        capture = None
+                else:
+                    capture = None
+
+                if node._behavior is not None:
+                    behaviors[node._behavior] = None
+
+                if node._document:
+                    append(DOCTYPE + newline)
+
+                if isinstance(content, str):
+                    if minify and isinstance(content, Code):
+                        content = content.minified
+                    elif tag not in RAW_TEXT:
+                        content = escape_text(content)
+                    append(f'{indent}{node._start_tag(ids)}{newline}{indents[level + 1]}{content}{newline}{indent}</{tag}>{newline}')
+                elif node._document:
+                    append(f'{indent}{node._start_tag(ids)}{newline}')
+                    if isinstance(content, list):
+                        indents = _indents(level + 2, unit)
+                        stack.append((_separated(content), level + 1, f'{indent}</{tag}>{newline}', capture))
+                        break
+                    append(f'{indent}</{tag}>{newline}')
+                elif isinstance(content, list) and content:
+                    append(f'{indent}{node._start_tag(ids)}{newline}')
+                    indents = _indents(level + 2, unit)
+                    if parallel is not None and len(content) >= threshold:
+                        for text, found in session.map(node, level + 1, minify):
+                            append(ids.resolve(text))
+                            behaviors.update(dict.fromkeys(found))
+                        content, capture = (), None
+                    if node._hoist:
+                        content = chain(content, (_HOISTED,))
+                    elif not content:
+                        append(f'{indent}</{tag}>{newline}')
+                        continue
+                    stack.append((iter(content), level + 1, f'{indent}</{tag}>{newline}', capture))
+                    break
+                elif content.__class__ is not list and content.__class__ is not tuple and hasattr(content, 'render_blocks'):
+                    # Content that writes its own markup, such as the rows of a Table.
+                    append(f'{indent}{node._start_tag(ids)}{newline}')
+                    indents = _indents(level + 2, unit)
+                    blocks = content.render_blocks(level + 1, unit, newline)
+                    stack.append((blocks, level + 1, f'{indent}</{tag}>{newline}', None))
+                    break
+                elif content.__class__ is not list and content.__class__ is not tuple and is_lazy(content):
+                    # Lazy children are consumed as they are rendered; the first
+                    # one is read ahead to tell an empty element.
+                    children = iter(content)
+                    first = next(children, _EMPTY)
+                    if first is _EMPTY:
+                        append(f'{indent}{node._start_tag(ids)}</{tag}>{newline}')
+                        continue
+                    append(f'{indent}{node._start_tag(ids)}{newline}')
+                    indents = _indents(level + 2, unit)
+                    children = chain((first,), children)
+                    if node._hoist:
+                        children = chain(children, (_HOISTED,))
+                    stack.append((children, level + 1, f'{indent}</{tag}>{newline}', None))
+                    break
+                elif content is not None and content.__class__ is not tuple and is_pending(content):
+                    self._check_pending(content)
+                    if buffer:
+                        yield ''.join(buffer)
+                        buffer.clear()
+                        flushes += 1
+                    node._children = as_content((yield Pending(content)))
+                    stack.append((iter((node,)), level, None, None))
+                    break
+                else:
+                    append(f'{indent}{node._start_tag(ids)}</{tag}>{newline}')
+            else:
+                stack.pop()
+                if end_tag is not None:
+                    if stats is not None:
+                        events.append((None, level, perf_counter(), size))
+                    append(end_tag)
+                if captured is not None and captured[2] == flushes:
+                    key, start, _ = captured
+                    text = ''.join(buffer[start:])
+                    del buffer[start:]
+                    buffer.append(text)
+                    cache.put(key, text)
+
+        if len(behaviors) > hoisted and not self._partial:
+            append(self.scripts(list(behaviors)[hoisted:], indent_level))
+        if session is not None:
+            session.close()
+        if stats is not None:
+            events.append((None, indent_level, perf_counter(), size))
+            recording.finish(indent_level)
+
+    def _check_pending(self, value: Any) -> None:
+        if not is_pending(value):
+            raise TypeError(f'Cannot render {value!r}: children must be elements')
+        if not self._resolving:
+            raise TypeError(f'Cannot render {value!r} synchronously, use render_async() or stream_async()')
+
+def render(node: Any, indent_level: int = 0, **options) -> str:
+    '''
+    Return the markup of node as a single string. The options are those of Renderer.
+    '''
+    return Renderer(**options).render(node, indent_level)
+
+def iter_render(node: Any, chunk_size: int = 4096, indent_level: int = 0, **options) -> Iterator[str]:
+    '''
+    Yield the markup of node in chunks of roughly chunk_size characters.
+    '''
+    return Renderer(chunk_size=chunk_size, **options).iter_render(node, indent_level)
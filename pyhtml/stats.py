@@ -0,0 +1,143 @@
+# pyhtml/stats.py
+
+from typing import Any, Callable, Dict, List, Tuple
+
+class ComponentStats:
+    __slots__ = ('count', 'seconds', 'self_seconds', 'size')
+
+    def __init__(self) -> None:
+        '''
+        What the elements of one component class cost: how many were rendered,
+        the time spent on them including (seconds) and excluding (self_seconds)
+        their descendants, and the characters of markup they emitted including
+        their descendants.
+        '''
+        self.count = 0
+        self.seconds = 0.0
+        self.self_seconds = 0.0
+        self.size = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f'ComponentStats(count={self.count}, seconds={self.seconds:.6f}, self_seconds={self.self_seconds:.6f}, size={self.size})'
+
+class RenderStats:
+    def __init__(self, hook: Callable[['RenderStats'], None] = None) -> None:
+        '''
+        Statistics of the renders done with Renderer(stats=...), accumulated until
+        reset(): per component class in components, and overall the time, the
+        characters emitted, the deepest and the widest level of the trees.
+        hook is called with the stats after each render, e.g. to forward them to
+        a metrics pipeline. Subtrees copied from a RenderCache count as their
+        root element only.
+        '''
+        self._hook = hook
+        self.reset()
+
+    def reset(self) -> None:
+        self.components: Dict[str, ComponentStats] = {}
+        self.renders = 0
+        self.seconds = 0.0
+        self.size = 0
+        self.depth = 0
+        self.width = 0
+
+    def _recording(self) -> '_Recording':
+        return _Recording(self)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'renders': self.renders,
+            'seconds': self.seconds,
+            'size': self.size,
+            'depth': self.depth,
+            'width': self.width,
+            'components': {name: stats.as_dict() for name, stats in self.components.items()},
+        }
+
+    def table(self) -> str:
+        '''
+        Return the components as a text table, the most expensive first.
+        '''
+        lines = [f'{"component":<20}{"count":>10}{"ms":>12}{"self ms":>12}{"chars":>12}']
+        ordered = sorted(self.components.items(), key=lambda item: item[1].self_seconds, reverse=True)
+        for name, stats in ordered:
+            lines.append(
+                f'{name:<20}{stats.count:>10}{stats.seconds * 1e3:>12.2f}'
+                f'{stats.self_seconds * 1e3:>12.2f}{stats.size:>12}'
+            )
+        lines.append(f'{self.renders} render(s), {self.seconds * 1e3:.2f} ms, {self.size} chars, depth {self.depth}, width {self.width}')
+        return '\n'.join(lines)
+
+    def __repr__(self) -> str:
+        return f'RenderStats(renders={self.renders}, seconds={self.seconds:.6f}, size={self.size}, depth={self.depth}, width={self.width})'
+
+class _Recording:
+    # Events are folded into the stats in batches of this many.
+    BATCH = 4096
+
+    def __init__(self, stats: RenderStats) -> None:
+        '''
+        The events of one render. Every element has an event (name of its class,
+        level, time, size) when the renderer reaches it, and the end of each
+        children list one with name None. An element ends at the next event of
+        the same or a lower level, so the events give the time and size of every
+        subtree without timing each element twice. They are folded into stats a
+        batch at a time, so a render takes no more memory for them than a batch.
+        '''
+        self.stats = stats
+        self.events: List[Tuple[Any, int, float, int]] = []
+        self.open_nodes: List[list] = []
+        self.widths: Dict[int, int] = {}
+        self.first = None
+        self.last = None
+
+    def fold(self) -> None:
+        events = self.events
+        if not events:
+            return
+        if self.first is None:
+            self.first = events[0]
+        self.last = events[-1]
+        components = self.stats.components
+        widths = self.widths
+        open_nodes = self.open_nodes
+        for name, level, time, size in events:
+            while open_nodes and open_nodes[-1][1] >= level:
+                node_name, _, start, start_size, child_seconds = open_nodes.pop()
+                seconds = time - start
+                stats = components.get(node_name)
+                if stats is None:
+                    stats = components[node_name] = ComponentStats()
+                stats.count += 1
+                stats.seconds += seconds
+                stats.self_seconds += seconds - child_seconds
+                stats.size += size - start_size
+                if open_nodes:
+                    open_nodes[-1][4] += seconds
+            if name is not None:
+                open_nodes.append([name, level, time, size, 0.0])
+                widths[level] = widths.get(level, 0) + 1
+        events.clear()
+
+    def finish(self, indent_level: int) -> None:
+        '''
+        Fold the events left and the totals of the render into the stats.
+        '''
+        self.fold()
+        if self.first is None:
+            return
+        stats = self.stats
+        _, _, end, end_size = self.last
+        _, _, start, start_size = self.first
+        widths = self.widths
+        stats.renders += 1
+        stats.seconds += end - start
+        stats.size += end_size - start_size
+        if widths:
+            stats.depth = max(stats.depth, max(widths) - indent_level + 1)
+            stats.width = max(stats.width, max(widths.values()))
+        if stats._hook is not None:
+            stats._hook(stats)
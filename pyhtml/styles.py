@@ -1,20 +1,21 @@
 # pyhtml/styles.py
 
-from typing import List, Literal
+from typing import List, Literal, Tuple
+from sys import intern
 
 class Styles:
     def __init__(self) -> None:
         '''
         This class is used to generate tailwindcss classes.
         '''
-        self._styles = []
+        # A dict used as an ordered set, so checking for duplicates is O(1).
+        self._styles = {}
 
     def _insert(self, cfg: str) -> 'Styles':
         '''
         Insert a new tailwindcss class to the list of styles.
         '''
-        if cfg not in self._styles:
-            self._styles.append(cfg)
+        self._styles.setdefault(intern(cfg))
         return self
 
     # Display utilities
@@ -403,7 +404,13 @@ class Styles:
         '''
         Return the list of tailwindcss classes.
         '''
-        return self._styles
+        return list(self._styles)
+
+    def to_tuple(self) -> Tuple[str, ...]:
+        '''
+        Return the tailwindcss classes as a tuple, e.g. to share them between elements.
+        '''
+        return tuple(self._styles)
 
 class ResponsiveStyles:
     def __init__(self, **kwargs) -> None:
@@ -0,0 +1,128 @@
+# pyhtml/table.py
+
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Union
+from itertools import repeat
+from .components import Base
+from .markup import Markup, escape_text
+
+# A formatter is a format spec such as ',.2f', or a function of one value.
+Formatter = Union[str, Callable[[Any], str]]
+
+# Cells are escaped a column at a time, joined on a character escaping leaves alone.
+_JOIN = '\x00'
+
+def format_column(values: Sequence, formatter: Formatter = None) -> List[str]:
+    '''
+    Return the text of every value of a column. Lists, array.array and NumPy
+    arrays are accepted; arrays are turned into Python values in one call, and
+    the formatter is mapped over the column without a Python loop.
+    '''
+    if hasattr(values, 'tolist'):
+        values = values.tolist()
+    if formatter is None:
+        return list(map(str, values))
+    if isinstance(formatter, str):
+        return list(map(format, values, repeat(formatter)))
+    return list(map(formatter, values))
+
+def escape_column(cells: List[str]) -> List[str]:
+    '''
+    Escape the text of a column in one pass over the joined column. Markup
+    returned by a formatter is kept as is.
+    '''
+    if not cells:
+        return cells
+    if any(cell.__class__ is not str for cell in cells):
+        return [escape_text(cell) for cell in cells]
+    joined = _JOIN.join(cells)
+    escaped = escape_text(joined)
+    if escaped is joined:
+        return cells
+    if joined.count(_JOIN) != len(cells) - 1:
+        return [escape_text(cell) for cell in cells]
+    return escaped.split(_JOIN)
+
+class Columns:
+    def __init__(
+        self,
+        columns: Dict[str, Sequence],
+        formatters: Dict[str, Formatter] = None,
+        headers: Dict[str, str] = None,
+        block_rows: int = 512,
+    ) -> None:
+        '''
+        The content of a Table. The renderer writes it with render_blocks, as
+        blocks of rows of markup, instead of walking an element per cell.
+        '''
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f'The columns of a Table must have the same length, not {sorted(lengths)}')
+        self.columns = columns
+        self.formatters = formatters or {}
+        self.headers = headers or {}
+        self.rows = lengths.pop() if lengths else 0
+        self.block_rows = block_rows
+
+    def render_blocks(self, level: int, unit: str, newline: str) -> Iterator[Markup]:
+        '''
+        Yield the markup of the thead and tbody of the table, whose own tag is
+        at level - 1, as the renderer would write the equivalent elements.
+        '''
+        indents = [unit * depth for depth in range(level, level + 4)]
+        section, row, cell, text = indents
+        names = list(self.columns)
+
+        if names:
+            labels = escape_column([str(self.headers.get(name, name)) for name in names])
+            header = ''.join(f'{cell}<th>{newline}{text}{label}{newline}{cell}</th>{newline}' for label in labels)
+            yield Markup(f'{section}<thead>{newline}{row}<tr>{newline}{header}{row}</tr>{newline}{section}</thead>{newline}')
+        else:
+            yield Markup(f'{section}<thead>{newline}{row}<tr></tr>{newline}{section}</thead>{newline}')
+
+        if not self.rows:
+            yield Markup(f'{section}<tbody></tbody>{newline}')
+            return
+        yield Markup(f'{section}<tbody>{newline}')
+        if not names:
+            yield Markup(f'{row}<tr></tr>{newline}' * self.rows)
+        else:
+            # One format call per row fills every cell; the cells are the arguments.
+            template = f'{row}<tr>{newline}' + f'{cell}<td>{newline}{text}{{}}{newline}{cell}</td>{newline}' * len(names) + f'{row}</tr>{newline}'
+            template = template.format
+            formatters = [self.formatters.get(name) for name in names]
+            columns = [self.columns[name] for name in names]
+            for start in range(0, self.rows, self.block_rows):
+                stop = start + self.block_rows
+                cells = [
+                    escape_column(format_column(values[start:stop], formatter))
+                    for values, formatter in zip(columns, formatters)
+                ]
+                yield Markup(''.join(map(template, *cells)))
+        yield Markup(f'{section}</tbody>{newline}')
+
+class Table(Base):
+    __slots__ = ()
+
+    def __init__(
+        self,
+        columns: Dict[str, Sequence],
+        formatters: Dict[str, Formatter] = None,
+        headers: Dict[str, str] = None,
+        **kwargs
+    ) -> None:
+        '''
+        A table of columnar data: columns maps each column name to its values (a
+        list, an array.array or a NumPy array), all of the same length. The text
+        of a column is made by its formatter, a format spec such as ',.2f' or a
+        function; headers maps column names to their labels. The cells are
+        written straight into the output, a block of rows at a time, so a table
+        of a million cells is not a million elements. Cells are escaped unless
+        their formatter returns Markup; formatters={'link': Markup} writes a
+        column of markup as is.
+        '''
+        super().__init__(
+            tag='table',
+            style='color:var(--color-tertiary);',
+            children=Columns(columns, formatters, headers),
+            **kwargs
+        )
@@ -0,0 +1,572 @@
+# pyhtml/tailwind.py
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import os
+import re
+
+Declarations = List[Tuple[str, str]]
+
+BREAKPOINTS = {'sm': '40rem', 'md': '48rem', 'lg': '64rem', 'xl': '80rem', '2xl': '96rem'}
+
+_SHADES = ('50', '100', '200', '300', '400', '500', '600', '700', '800', '900', '950')
+
+_PALETTE = {
+    'slate':   '#f8fafc #f1f5f9 #e2e8f0 #cbd5e1 #94a3b8 #64748b #475569 #334155 #1e293b #0f172a #020617',
+    'gray':    '#f9fafb #f3f4f6 #e5e7eb #d1d5db #9ca3af #6b7280 #4b5563 #374151 #1f2937 #111827 #030712',
+    'zinc':    '#fafafa #f4f4f5 #e4e4e7 #d4d4d8 #a1a1aa #71717a #52525b #3f3f46 #27272a #18181b #09090b',
+    'neutral': '#fafafa #f5f5f5 #e5e5e5 #d4d4d4 #a3a3a3 #737373 #525252 #404040 #262626 #171717 #0a0a0a',
+    'stone':   '#fafaf9 #f5f5f4 #e7e5e4 #d6d3d1 #a8a29e #78716c #57534e #44403c #292524 #1c1917 #0c0a09',
+    'red':     '#fef2f2 #fee2e2 #fecaca #fca5a5 #f87171 #ef4444 #dc2626 #b91c1c #991b1b #7f1d1d #450a0a',
+    'orange':  '#fff7ed #ffedd5 #fed7aa #fdba74 #fb923c #f97316 #ea580c #c2410c #9a3412 #7c2d12 #431407',
+    'amber':   '#fffbeb #fef3c7 #fde68a #fcd34d #fbbf24 #f59e0b #d97706 #b45309 #92400e #78350f #451a03',
+    'yellow':  '#fefce8 #fef9c3 #fef08a #fde047 #facc15 #eab308 #ca8a04 #a16207 #854d0e #713f12 #422006',
+    'lime':    '#f7fee7 #ecfccb #d9f99d #bef264 #a3e635 #84cc16 #65a30d #4d7c0f #3f6212 #365314 #1a2e05',
+    'green':   '#f0fdf4 #dcfce7 #bbf7d0 #86efac #4ade80 #22c55e #16a34a #15803d #166534 #14532d #052e16',
+    'emerald': '#ecfdf5 #d1fae5 #a7f3d0 #6ee7b7 #34d399 #10b981 #059669 #047857 #065f46 #064e3b #022c22',
+    'teal':    '#f0fdfa #ccfbf1 #99f6e4 #5eead4 #2dd4bf #14b8a6 #0d9488 #0f766e #115e59 #134e4a #042f2e',
+    'cyan':    '#ecfeff #cffafe #a5f3fc #67e8f9 #22d3ee #06b6d4 #0891b2 #0e7490 #155e75 #164e63 #083344',
+    'sky':     '#f0f9ff #e0f2fe #bae6fd #7dd3fc #38bdf8 #0ea5e9 #0284c7 #0369a1 #075985 #0c4a6e #082f49',
+    'blue':    '#eff6ff #dbeafe #bfdbfe #93c5fd #60a5fa #3b82f6 #2563eb #1d4ed8 #1e40af #1e3a8a #172554',
+    'indigo':  '#eef2ff #e0e7ff #c7d2fe #a5b4fc #818cf8 #6366f1 #4f46e5 #4338ca #3730a3 #312e81 #1e1b4b',
+    'violet':  '#f5f3ff #ede9fe #ddd6fe #c4b5fd #a78bfa #8b5cf6 #7c3aed #6d28d9 #5b21b6 #4c1d95 #2e1065',
+    'purple':  '#faf5ff #f3e8ff #e9d5ff #d8b4fe #c084fc #a855f7 #9333ea #7e22ce #6b21a8 #581c87 #3b0764',
+    'fuchsia': '#fdf4ff #fae8ff #f5d0fe #f0abfc #e879f9 #d946ef #c026d3 #a21caf #86198f #701a75 #4a044e',
+    'pink':    '#fdf2f8 #fce7f3 #fbcfe8 #f9a8d4 #f472b6 #ec4899 #db2777 #be185d #9d174d #831843 #500724',
+    'rose':    '#fff1f2 #ffe4e6 #fecdd3 #fda4af #fb7185 #f43f5e #e11d48 #be123c #9f1239 #881337 #4c0519',
+}
+
+COLORS = {
+    'inherit': 'inherit',
+    'current': 'currentcolor',
+    'transparent': 'transparent',
+    'black': '#000',
+    'white': '#fff',
+}
+for _family, _values in _PALETTE.items():
+    for _shade, _value in zip(_SHADES, _values.split()):
+        COLORS[f'{_family}-{_shade}'] = _value
+
+FONT_SIZES = {
+    'xs': ('0.75rem', '1rem'), 'sm': ('0.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'),
+    '6xl': ('3.75rem', '1'), '7xl': ('4.5rem', '1'), '8xl': ('6rem', '1'), '9xl': ('8rem', '1'),
+}
+
+FONT_WEIGHTS = {
+    'thin': '100', 'extralight': '200', 'light': '300', 'normal': '400', 'medium': '500',
+    'semibold': '600', 'bold': '700', 'extrabold': '800', 'black': '900',
+}
+
+FONT_FAMILIES = {
+    'sans': 'ui-sans-serif, system-ui, sans-serif',
+    'serif': 'ui-serif, Georgia, Cambria, "Times New Roman", Times, serif',
+    'mono': 'ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace',
+}
+
+RADII = {
+    'none': '0', 'xs': '0.125rem', 'sm': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem', 'xl': '0.75rem',
+    '2xl': '1rem', '3xl': '1.5rem', '4xl': '2rem', 'full': '9999px',
+}
+
+SHADOWS = {
+    'xs': '0 1px 2px 0 rgb(0 0 0 / 0.05)',
+    'sm': '0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)',
+    'md': '0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)',
+    'lg': '0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)',
+    'xl': '0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)',
+    '2xl': '0 25px 50px -12px rgb(0 0 0 / 0.25)',
+    'none': '0 0 #0000',
+}
+
+CONTAINERS = {
+    '3xs': '16rem', '2xs': '18rem', 'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem',
+    'xl': '36rem', '2xl': '42rem', '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem',
+    '7xl': '80rem', 'prose': '65ch',
+}
+
+PSEUDO_CLASSES = {
+    'hover': ':hover', 'focus': ':focus', 'focus-visible': ':focus-visible', 'focus-within': ':focus-within',
+    'active': ':active', 'visited': ':visited', 'disabled': ':disabled', 'enabled': ':enabled',
+    'checked': ':checked', 'required': ':required', 'invalid': ':invalid', 'placeholder-shown': ':placeholder-shown',
+    'first': ':first-child', 'last': ':last-child', 'only': ':only-child', 'odd': ':nth-child(odd)',
+    'even': ':nth-child(even)', 'empty': ':empty',
+}
+
+PSEUDO_ELEMENTS = {
+    'before': '::before', 'after': '::after', 'placeholder': '::placeholder', 'marker': '::marker',
+    'selection': '::selection', 'file': '::file-selector-button', 'backdrop': '::backdrop',
+}
+
+DIRECTIONS = {
+    'rtl': ':where(:dir(rtl), [dir="rtl"], [dir="rtl"] *)',
+    'ltr': ':where(:dir(ltr), [dir="ltr"], [dir="ltr"] *)',
+}
+
+PREFLIGHT = '''*,::after,::before,::backdrop,::file-selector-button{box-sizing:border-box;margin:0;padding:0;border:0 solid}
+*,::after,::before,::backdrop{--tw-translate-x:0;--tw-translate-y:0;--tw-ring-color:currentcolor;--tw-content:''}
+html,:host{line-height:1.5;-webkit-text-size-adjust:100%;tab-size:4;font-family:ui-sans-serif,system-ui,sans-serif,"Apple Color Emoji","Segoe UI Emoji","Segoe UI Symbol","Noto Color Emoji";-webkit-tap-highlight-color:transparent}
+hr{height:0;color:inherit;border-top-width:1px}
+h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}
+a{color:inherit;-webkit-text-decoration:inherit;text-decoration:inherit}
+b,strong{font-weight:bolder}
+code,kbd,samp,pre{font-family:ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,"Liberation Mono","Courier New",monospace;font-size:1em}
+small{font-size:80%}
+table{text-indent:0;border-color:inherit;border-collapse:collapse}
+ol,ul,menu{list-style:none}
+img,svg,video,canvas,audio,iframe,embed,object{display:block;vertical-align:middle}
+img,video{max-width:100%;height:auto}
+button,input,select,optgroup,textarea,::file-selector-button{font:inherit;font-feature-settings:inherit;font-variation-settings:inherit;letter-spacing:inherit;color:inherit;border-radius:0;background-color:transparent;opacity:1}
+::placeholder{opacity:1}
+textarea{resize:vertical}
+button,input:where([type=button],[type=reset],[type=submit]),::file-selector-button{appearance:button}
+[hidden]:where(:not([hidden=until-found])){display:none!important}
+'''
+
+# Values
+
+def _arbitrary(value: str) -> Optional[str]:
+    if len(value) > 2 and value[0] == '[' and value[-1] == ']':
+        return value[1:-1].replace('_', ' ')
+    return None
+
+_NUMBER = re.compile(r'\d+(\.\d+)?')
+
+def _number(value: str) -> Optional[float]:
+    return float(value) if _NUMBER.fullmatch(value) else None
+
+def _format(number: float) -> str:
+    return f'{number:.4f}'.rstrip('0').rstrip('.')
+
+def _spacing(value: str) -> Optional[str]:
+    if value == 'px':
+        return '1px'
+    if value in ('full', 'auto'):
+        return '100%' if value == 'full' else 'auto'
+    number = _number(value)
+    if number is not None:
+        return '0' if number == 0 else f'{_format(number * 0.25)}rem'
+    if '/' in value:
+        numerator, _, denominator = value.partition('/')
+        if numerator.isdigit() and denominator.isdigit() and int(denominator):
+            return f'{_format(int(numerator) / int(denominator) * 100)}%'
+    return _arbitrary(value)
+
+def _size(axis: str) -> Callable[[str], Optional[str]]:
+    viewport = {
+        'screen': f'100v{axis}', f'dv{axis}': f'100dv{axis}', f'sv{axis}': f'100sv{axis}',
+        f'lv{axis}': f'100lv{axis}', 'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content',
+    }
+    def resolve(value: str) -> Optional[str]:
+        return viewport.get(value) or _spacing(value)
+    return resolve
+
+def _max_width(value: str) -> Optional[str]:
+    return CONTAINERS.get(value) or _size('w')(value)
+
+def _color(value: str) -> Optional[str]:
+    value, _, alpha = value.partition('/')
+    color = COLORS.get(value) or _arbitrary(value)
+    if color is None:
+        return None
+    if alpha:
+        if not alpha.isdigit():
+            return None
+        return f'color-mix(in oklab, {color} {alpha}%, transparent)'
+    return color
+
+def _integer(value: str) -> Optional[str]:
+    return value if value.isdigit() else _arbitrary(value)
+
+def _keywords(mapping: Dict[str, str]) -> Callable[[str], Optional[str]]:
+    return mapping.get
+
+# Utilities
+
+_STATIC: Dict[str, Declarations] = {
+    'block': [('display', 'block')],
+    'inline-block': [('display', 'inline-block')],
+    'inline': [('display', 'inline')],
+    'flex': [('display', 'flex')],
+    'inline-flex': [('display', 'inline-flex')],
+    'grid': [('display', 'grid')],
+    'inline-grid': [('display', 'inline-grid')],
+    'contents': [('display', 'contents')],
+    'hidden': [('display', 'none')],
+    'static': [('position', 'static')],
+    'fixed': [('position', 'fixed')],
+    'absolute': [('position', 'absolute')],
+    'relative': [('position', 'relative')],
+    'sticky': [('position', 'sticky')],
+    'visible': [('visibility', 'visible')],
+    'invisible': [('visibility', 'hidden')],
+    'collapse': [('visibility', 'collapse')],
+    'flex-row': [('flex-direction', 'row')],
+    'flex-row-reverse': [('flex-direction', 'row-reverse')],
+    'flex-col': [('flex-direction', 'column')],
+    'flex-col-reverse': [('flex-direction', 'column-reverse')],
+    'flex-wrap': [('flex-wrap', 'wrap')],
+    'flex-nowrap': [('flex-wrap', 'nowrap')],
+    'flex-1': [('flex', '1')],
+    'flex-auto': [('flex', 'auto')],
+    'flex-none': [('flex', 'none')],
+    'grow': [('flex-grow', '1')],
+    'shrink-0': [('flex-shrink', '0')],
+    'rounded': [('border-radius', '0.25rem')],
+    'border': [('border-style', 'solid'), ('border-width', '1px')],
+    'shadow': [('box-shadow', SHADOWS['sm'])],
+    'underline': [('text-decoration-line', 'underline')],
+    'overline': [('text-decoration-line', 'overline')],
+    'line-through': [('text-decoration-line', 'line-through')],
+    'no-underline': [('text-decoration-line', 'none')],
+    'italic': [('font-style', 'italic')],
+    'not-italic': [('font-style', 'normal')],
+    'uppercase': [('text-transform', 'uppercase')],
+    'lowercase': [('text-transform', 'lowercase')],
+    'capitalize': [('text-transform', 'capitalize')],
+    'truncate': [('overflow', 'hidden'), ('text-overflow', 'ellipsis'), ('white-space', 'nowrap')],
+    'sr-only': [
+        ('position', 'absolute'), ('width', '1px'), ('height', '1px'), ('padding', '0'), ('margin', '-1px'),
+        ('overflow', 'hidden'), ('clip', 'rect(0, 0, 0, 0)'), ('white-space', 'nowrap'), ('border-width', '0'),
+    ],
+    'not-sr-only': [
+        ('position', 'static'), ('width', 'auto'), ('height', 'auto'), ('padding', '0'), ('margin', '0'),
+        ('overflow', 'visible'), ('clip', 'auto'), ('white-space', 'normal'),
+    ],
+    'outline-none': [('outline-style', 'none')],
+    'outline-hidden': [('outline', '2px solid transparent'), ('outline-offset', '2px')],
+    'ring': [('box-shadow', '0 0 0 1px var(--tw-ring-color)')],
+    'transition': [
+        ('transition-property', 'color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, transform, translate, scale, rotate, filter, backdrop-filter'),
+        ('transition-timing-function', 'cubic-bezier(0.4, 0, 0.2, 1)'), ('transition-duration', '150ms'),
+    ],
+    'transition-all': [
+        ('transition-property', 'all'),
+        ('transition-timing-function', 'cubic-bezier(0.4, 0, 0.2, 1)'), ('transition-duration', '150ms'),
+    ],
+    'transition-colors': [
+        ('transition-property', 'color, background-color, border-color, text-decoration-color, fill, stroke'),
+        ('transition-timing-function', 'cubic-bezier(0.4, 0, 0.2, 1)'), ('transition-duration', '150ms'),
+    ],
+    'transition-opacity': [
+        ('transition-property', 'opacity'),
+        ('transition-timing-function', 'cubic-bezier(0.4, 0, 0.2, 1)'), ('transition-duration', '150ms'),
+    ],
+    # Markers for peer-* and group-* variants, they have no styles of their own.
+    'peer': [],
+    'group': [],
+}
+
+_ALIGN = {
+    'start': 'flex-start', 'end': 'flex-end', 'center': 'center', 'between': 'space-between',
+    'around': 'space-around', 'evenly': 'space-evenly', 'stretch': 'stretch', 'normal': 'normal',
+}
+_ITEMS = {'start': 'flex-start', 'end': 'flex-end', 'center': 'center', 'baseline': 'baseline', 'stretch': 'stretch'}
+_OVERFLOW = {value: value for value in ('auto', 'hidden', 'clip', 'visible', 'scroll')}
+_TEXT_ALIGN = {value: value for value in ('left', 'center', 'right', 'justify', 'start', 'end')}
+_CURSORS = {
+    value: value for value in (
+        'auto', 'default', 'pointer', 'wait', 'text', 'move', 'help', 'not-allowed', 'none',
+        'progress', 'cell', 'crosshair', 'grab', 'grabbing', 'zoom-in', 'zoom-out',
+    )
+}
+
+def _grid_tracks(value: str) -> Optional[str]:
+    if value.isdigit():
+        return f'repeat({value}, minmax(0, 1fr))'
+    return 'none' if value == 'none' else _arbitrary(value)
+
+def _span(value: str) -> Optional[str]:
+    if value.isdigit():
+        return f'span {value} / span {value}'
+    return '1 / -1' if value == 'full' else None
+
+def _percent(value: str) -> Optional[str]:
+    return f'{value}%' if value.isdigit() else _arbitrary(value)
+
+def _milliseconds(value: str) -> Optional[str]:
+    return f'{value}ms' if value.isdigit() else _arbitrary(value)
+
+def _font_size(value: str) -> Optional[Declarations]:
+    if value in FONT_SIZES:
+        size, line_height = FONT_SIZES[value]
+        return [('font-size', size), ('line-height', line_height)]
+    return None
+
+def _border_width(value: str) -> Optional[str]:
+    if value.isdigit():
+        return f'{value}px'
+    return _arbitrary(value)
+
+def _content(value: str) -> Optional[Declarations]:
+    content = _arbitrary(value)
+    if content is None:
+        return None
+    return [('--tw-content', content), ('content', 'var(--tw-content)')]
+
+# Prefix utilities as (prefix, resolve value, properties, allows a negative value).
+# resolve returns a value for every property, or the declarations themselves.
+# Their order is the order of the rules in the stylesheet, after the static
+# utilities, so shorthands (p-*) come before the longhands (pt-*) that override them.
+_PREFIXES: List[Tuple[str, Callable[[str], Any], Tuple[str, ...], bool]] = [
+    ('opacity-', _percent, ('opacity',), False),
+    ('inset-x-', _spacing, ('inset-inline',), True),
+    ('inset-y-', _spacing, ('inset-block',), True),
+    ('inset-', _spacing, ('inset',), True),
+    ('start-', _spacing, ('inset-inline-start',), True),
+    ('end-', _spacing, ('inset-inline-end',), True),
+    ('top-', _spacing, ('top',), True),
+    ('right-', _spacing, ('right',), True),
+    ('bottom-', _spacing, ('bottom',), True),
+    ('left-', _spacing, ('left',), True),
+    ('z-', lambda value: 'auto' if value == 'auto' else _integer(value), ('z-index',), True),
+    ('overflow-x-', _keywords(_OVERFLOW), ('overflow-x',), False),
+    ('overflow-y-', _keywords(_OVERFLOW), ('overflow-y',), False),
+    ('overflow-', _keywords(_OVERFLOW), ('overflow',), False),
+    ('grid-cols-', _grid_tracks, ('grid-template-columns',), False),
+    ('grid-rows-', _grid_tracks, ('grid-template-rows',), False),
+    ('col-span-', _span, ('grid-column',), False),
+    ('row-span-', _span, ('grid-row',), False),
+    ('place-content-', _keywords(_ALIGN), ('place-content',), False),
+    ('place-items-', _keywords(_ITEMS), ('place-items',), False),
+    ('place-self-', _keywords(dict(_ITEMS, auto='auto')), ('place-self',), False),
+    ('justify-items-', _keywords(_ITEMS), ('justify-items',), False),
+    ('justify-self-', _keywords(dict(_ITEMS, auto='auto')), ('justify-self',), False),
+    ('justify-', _keywords(_ALIGN), ('justify-content',), False),
+    ('items-', _keywords(_ITEMS), ('align-items',), False),
+    ('self-', _keywords(dict(_ITEMS, auto='auto')), ('align-self',), False),
+    ('content-', lambda value: _content(value) or _keywords(_ALIGN)(value), ('align-content',), False),
+    ('gap-x-', _spacing, ('column-gap',), False),
+    ('gap-y-', _spacing, ('row-gap',), False),
+    ('gap-', _spacing, ('gap',), False),
+    ('p-', _spacing, ('padding',), False),
+    ('px-', _spacing, ('padding-inline',), False),
+    ('py-', _spacing, ('padding-block',), False),
+    ('ps-', _spacing, ('padding-inline-start',), False),
+    ('pe-', _spacing, ('padding-inline-end',), False),
+    ('pt-', _spacing, ('padding-top',), False),
+    ('pr-', _spacing, ('padding-right',), False),
+    ('pb-', _spacing, ('padding-bottom',), False),
+    ('pl-', _spacing, ('padding-left',), False),
+    ('m-', _spacing, ('margin',), True),
+    ('mx-', _spacing, ('margin-inline',), True),
+    ('my-', _spacing, ('margin-block',), True),
+    ('ms-', _spacing, ('margin-inline-start',), True),
+    ('me-', _spacing, ('margin-inline-end',), True),
+    ('mt-', _spacing, ('margin-top',), True),
+    ('mr-', _spacing, ('margin-right',), True),
+    ('mb-', _spacing, ('margin-bottom',), True),
+    ('ml-', _spacing, ('margin-left',), True),
+    ('size-', _size('w'), ('width', 'height'), False),
+    ('w-', _size('w'), ('width',), False),
+    ('min-w-', _size('w'), ('min-width',), False),
+    ('max-w-', _max_width, ('max-width',), False),
+    ('h-', _size('h'), ('height',), False),
+    ('min-h-', _size('h'), ('min-height',), False),
+    ('max-h-', _size('h'), ('max-height',), False),
+    ('translate-x-', _spacing, ('--tw-translate-x',), True),
+    ('translate-y-', _spacing, ('--tw-translate-y',), True),
+    ('rounded-', _keywords(RADII), ('border-radius',), False),
+    ('border-x-', _border_width, ('border-inline-style', 'border-inline-width'), False),
+    ('border-y-', _border_width, ('border-block-style', 'border-block-width'), False),
+    ('border-t-', _border_width, ('border-top-style', 'border-top-width'), False),
+    ('border-r-', _border_width, ('border-right-style', 'border-right-width'), False),
+    ('border-b-', _border_width, ('border-bottom-style', 'border-bottom-width'), False),
+    ('border-l-', _border_width, ('border-left-style', 'border-left-width'), False),
+    ('border-', lambda value: _border_width(value) or _color(value), ('border-width',), False),
+    ('bg-', _color, ('background-color',), False),
+    ('shadow-', _keywords(SHADOWS), ('box-shadow',), False),
+    ('ring-', lambda value: _border_width(value) or _color(value), ('box-shadow',), False),
+    ('font-', lambda value: FONT_WEIGHTS.get(value) or FONT_FAMILIES.get(value), ('font-weight',), False),
+    ('text-', lambda value: _font_size(value) or _TEXT_ALIGN.get(value) or _color(value), ('font-size',), False),
+    ('cursor-', _keywords(_CURSORS), ('cursor',), False),
+    ('duration-', _milliseconds, ('transition-duration',), False),
+]
+
+def _declarations(utility: str) -> Optional[Tuple[int, Declarations]]:
+    '''
+    Return the rank and the declarations of a utility class without variants,
+    or None when it is not supported.
+    '''
+    important = utility.endswith('!') or utility.startswith('!')
+    utility = utility.strip('!')
+    declarations = None
+    rank = 0
+
+    if utility in _STATIC:
+        declarations = list(_STATIC[utility])
+        rank = list(_STATIC).index(utility)
+    else:
+        negative = utility.startswith('-')
+        name = utility[1:] if negative else utility
+        for rank, (prefix, resolve, properties, allows_negative) in enumerate(_PREFIXES, len(_STATIC)):
+            if not name.startswith(prefix) or (negative and not allows_negative):
+                continue
+            value = resolve(name[len(prefix):])
+            if value is None:
+                continue
+            if isinstance(value, list):
+                declarations = value
+            else:
+                if negative:
+                    value = f'calc({value} * -1)'
+                declarations = _special(prefix, value) or [(prop, value) for prop in properties]
+            break
+
+    if declarations is None:
+        return None
+    if any(prop in ('--tw-translate-x', '--tw-translate-y') for prop, _ in declarations):
+        declarations.append(('translate', 'var(--tw-translate-x) var(--tw-translate-y)'))
+    if important:
+        declarations = [(prop, f'{value} !important') for prop, value in declarations]
+    return rank, declarations
+
+def _special(prefix: str, value: str) -> Optional[Declarations]:
+    '''
+    Pick the property of the prefixes whose values can be of different kinds.
+    '''
+    if prefix == 'border-':
+        if value.endswith('px') or value[0].isdigit():
+            return [('border-style', 'solid'), ('border-width', value)]
+        return [('border-color', value)]
+    if prefix.startswith('border-'):
+        side = {'x': 'inline', 'y': 'block', 't': 'top', 'r': 'right', 'b': 'bottom', 'l': 'left'}[prefix[7]]
+        return [(f'border-{side}-style', 'solid'), (f'border-{side}-width', value)]
+    if prefix == 'ring-':
+        if value.endswith('px'):
+            return [('box-shadow', f'0 0 0 {value} var(--tw-ring-color)')]
+        return [('--tw-ring-color', value)]
+    if prefix == 'text-':
+        if value in _TEXT_ALIGN:
+            return [('text-align', value)]
+        return [('color', value)]
+    if prefix == 'font-':
+        if value.isdigit():
+            return [('font-weight', value)]
+        return [('font-family', value)]
+    return None
+
+# Variants and selectors
+
+def _split_variants(name: str) -> List[str]:
+    '''
+    Split a class name on the colons that are not inside an arbitrary value.
+    '''
+    parts, depth, start = [], 0, 0
+    for index, char in enumerate(name):
+        if char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        elif char == ':' and depth == 0:
+            parts.append(name[start:index])
+            start = index + 1
+    parts.append(name[start:])
+    return parts
+
+def escape_class(name: str) -> str:
+    '''
+    Escape a class name for use in a CSS selector.
+    '''
+    escaped = ''.join(char if char.isalnum() or char in '-_' or ord(char) > 127 else f'\\{char}' for char in name)
+    if name[:1].isdigit():
+        escaped = f'\\{ord(name[0]):x} {escaped[1:]}'
+    return escaped
+
+def _rule(name: str) -> Optional[Tuple[tuple, Tuple[str, ...], str, Declarations]]:
+    '''
+    Return the sort key, media queries, selector and declarations of a class,
+    or None when it is not supported.
+    '''
+    *variants, utility = _split_variants(name)
+    found = _declarations(utility)
+    if found is None:
+        return None
+    rank, declarations = found
+
+    selector = f'.{escape_class(name)}'
+    before, after, media = '', '', []
+    breakpoint = 0
+    for variant in variants:
+        if variant in BREAKPOINTS:
+            media.append(f'(width >= {BREAKPOINTS[variant]})')
+            breakpoint = max(breakpoint, list(BREAKPOINTS).index(variant) + 1)
+        elif variant == 'dark':
+            media.append('(prefers-color-scheme: dark)')
+        elif variant in PSEUDO_CLASSES:
+            selector += PSEUDO_CLASSES[variant]
+        elif variant in DIRECTIONS:
+            selector += DIRECTIONS[variant]
+        elif variant in PSEUDO_ELEMENTS:
+            after = PSEUDO_ELEMENTS[variant]
+            if variant in ('before', 'after') and ('content', 'var(--tw-content)') not in declarations:
+                declarations = [('content', 'var(--tw-content)')] + declarations
+        elif variant.startswith(('peer-', 'group-')) and variant.partition('-')[2] in PSEUDO_CLASSES:
+            marker, _, state = variant.partition('-')
+            combinator = ' ~ ' if marker == 'peer' else ' '
+            before = f'.{marker}{PSEUDO_CLASSES[state]}{combinator}{before}'
+        else:
+            return None
+
+    key = (breakpoint, len(media), bool(variants), rank, name)
+    return key, tuple(media), f'{before}{selector}{after}', declarations
+
+# Collecting and writing
+
+def collect_classes(*sources: Any) -> List[str]:
+    '''
+    Return the class names used in the given trees or rendered pages, in the
+    order they are first found. Class entries holding several classes, such
+    as "flex flex-row" from Styles.flex, are split.
+    '''
+    found = {}
+    for source in sources:
+        if isinstance(source, str):
+            for value in re.findall(r'\sclass="([^"]*)"', source):
+                found.update(dict.fromkeys(value.split()))
+            continue
+        stack = [source]
+        while stack:
+            node = stack.pop()
+            for entry in node._class_names:
+                found.update(dict.fromkeys(entry.split()))
+            if isinstance(node._children, list):
+                stack.extend(reversed([child for child in node._children if hasattr(child, '_tag')]))
+    return list(found)
+
+def generate_css(classes: Iterable[str], preflight: bool = True) -> Tuple[str, List[str]]:
+    '''
+    Return a stylesheet with a rule for every supported class, and the classes
+    that are not supported.
+    '''
+    rules, unsupported = [], []
+    for name in dict.fromkeys(classes):
+        rule = _rule(name)
+        if rule is None:
+            unsupported.append(name)
+        elif rule[3]:
+            rules.append(rule)
+    rules.sort(key=lambda rule: rule[0])
+
+    lines = [PREFLIGHT.rstrip('\n')] if preflight else []
+    for _, media, selector, declarations in rules:
+        body = ';'.join(f'{prop}:{value}' for prop, value in declarations)
+        if media:
+            lines.append(f'@media {" and ".join(media)}{{{selector}{{{body}}}}}')
+        else:
+            lines.append(f'{selector}{{{body}}}')
+    return '\n'.join(lines) + '\n', unsupported
+
+def build_stylesheet(*sources: Any, path: str = os.path.join('static', 'tailwind.css'), preflight: bool = True) -> List[str]:
+    '''
+    Write the stylesheet for the classes used in the given trees or rendered
+    pages to path, and return the classes that are not supported. Link it with
+    Head(stylesheet=...) or HTML(stylesheet=...) instead of the Tailwind script.
+    '''
+    css, unsupported = generate_css(collect_classes(*sources), preflight=preflight)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(css)
+    return unsupported
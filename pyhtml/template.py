@@ -0,0 +1,71 @@
+# pyhtml/template.py
+
+from typing import Any, Callable, Dict, List
+import re
+from .markup import RAW_TEXT, escape
+
+_SLOT_PATTERN = re.compile('\x00([^\x00]*)\x00')
+# The slot markers, and the tags that open or close the content of script and
+# style, which is written without escaping.
+_CONTEXT_PATTERN = re.compile('\x00[^\x00]*\x00|<(/?)(' + '|'.join(RAW_TEXT) + ')[\\s>/]', re.IGNORECASE)
+
+class Slot(str):
+    def __new__(cls, name: str) -> 'Slot':
+        '''
+        A named placeholder for a text child or an attribute value. It renders as
+        a marker that compile() turns into a slot of the template.
+        '''
+        slot = super().__new__(cls, f'\x00{name}\x00')
+        slot.name = name
+        return slot
+
+    def __repr__(self) -> str:
+        return f'Slot({self.name!r})'
+
+class Template:
+    def __init__(self, segments: List[str], slots: List[str], raw: List[bool] = None) -> None:
+        '''
+        A precompiled tree: the static markup between the slots, and the slot names
+        in the order they appear. Calling it only joins the segments with the
+        escaped values, so its cost depends on the number of slots, not nodes.
+        Values are escaped as the renderer escapes them: not at all in the slots
+        that raw marks, those in the content of script and style, and otherwise
+        unless they are Markup.
+        '''
+        self._segments = segments
+        self._slots = slots
+        raw = raw or [False] * len(slots)
+        self._escapes: List[Callable[[Any], str]] = [str if is_raw else escape for is_raw in raw]
+
+    @property
+    def slots(self) -> List[str]:
+        return self._slots
+
+    def __call__(self, context: Dict[str, Any] = None, **kwargs) -> str:
+        values = dict(context or {}, **kwargs)
+        segments = self._segments
+        parts = [segments[0]]
+        for index, (name, escape_value) in enumerate(zip(self._slots, self._escapes), start=1):
+            parts.append(escape_value(values[name]))
+            parts.append(segments[index])
+        return ''.join(parts)
+
+def compile_template(markup: str) -> Template:
+    '''
+    Split rendered markup on its slot markers, noting which slots are in the
+    content of a script or style element.
+    '''
+    pieces = _SLOT_PATTERN.split(markup)
+    raw = []
+    inside = None
+    for match in _CONTEXT_PATTERN.finditer(markup):
+        closing, tag = match.groups()
+        if tag is None:
+            # Slots in the attributes of the script or style tag are not raw.
+            raw.append(inside is not None and match.start() >= content)
+        elif inside is None and not closing:
+            # Attribute values are escaped, so the first > ends the start tag.
+            inside, content = tag.lower(), markup.find('>', match.start()) + 1
+        elif closing and tag.lower() == inside:
+            inside = None
+    return Template(segments=pieces[0::2], slots=pieces[1::2], raw=raw)
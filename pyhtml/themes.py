@@ -1,6 +1,8 @@
-# pyhtml/theme.py
+# pyhtml/themes.py
 
-from typing import List
+from typing import List, Optional
+import os
+from .minify import Code
 
 class ColorScheme:
     def __init__(
@@ -28,15 +30,67 @@ class ColorScheme:
 class Theme:
     def __init__(self) -> None:
         self._color_schemes = {}
+        self._version = 0
+        self._stylesheet = None
+        self._stylesheet_version = -1
+        self._href = None
 
     def add(self, key: str, color_scheme: ColorScheme) -> None:
         self._color_schemes[key] = color_scheme
+        self._version += 1
+        # A published file no longer matches the theme.
+        self._href = None
 
     @property
     def keys(self) -> List[str]:
         return list(self._color_schemes.keys())
 
-    def _to_str_(self) -> str: 
+    @property
+    def version(self) -> int:
+        '''
+        A counter increased by every add(), used to memoize the stylesheet.
+        '''
+        return self._version
+
+    @property
+    def stylesheet(self) -> Code:
+        '''
+        The CSS of every color scheme, generated once per version.
+        '''
+        if self._stylesheet_version != self._version:
+            self._stylesheet = Code(self._format(), language='css')
+            self._stylesheet_version = self._version
+        return self._stylesheet
+
+    @property
+    def href(self) -> Optional[str]:
+        '''
+        The URL of the file written by publish(), or None when the stylesheet is
+        inlined in every Head.
+        '''
+        return self._href
+
+    def publish(self, directory: str = 'static', url: str = '/static/') -> str:
+        '''
+        Write the stylesheet once as theme.<hash>.css in directory and make Head
+        link it from url instead of inlining it, so browsers cache it across pages.
+        The name changes with the content, so the file can be cached forever.
+        '''
+        from hashlib import blake2b
+        css = self.stylesheet.minified
+        filename = f'theme.{blake2b(css.encode("utf-8"), digest_size=8).hexdigest()}.css'
+        path = os.path.join(directory, filename)
+        if not os.path.isfile(path):
+            os.makedirs(directory, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(css)
+        self._href = url.rstrip('/') + '/' + filename
+        return path
+
+    def _to_str_(self) -> str:
+        return self.stylesheet
+
+    def _format(self) -> str:
         template ='''
 {key} {{
     --color-primary: {primary};